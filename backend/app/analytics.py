@@ -0,0 +1,304 @@
+import asyncio
+import bisect
+import time
+from datetime import date, timedelta
+from itertools import repeat
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.cache import VersionedCache
+from app.config import get_settings
+from app.metrics import metrics
+from app.models.attendance import AttendanceStatus
+from app.repositories import get_employee_repository, get_attendance_repository
+from app.tenancy import get_current_tenant
+
+settings = get_settings()
+
+# Matrix cell codes
+UNMARKED = 0
+PRESENT = 1
+ABSENT = 2
+
+STATUS_CODES = {
+    AttendanceStatus.PRESENT.value: PRESENT,
+    AttendanceStatus.ABSENT.value: ABSENT,
+}
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+class AttendanceMatrix:
+    """
+    Attendance of every employee over a date range as an employee x day array.
+
+    Rows follow `employee_ids`, columns are consecutive days from `start_date`.
+    Each employee's department is stored as an index into `department_names`,
+    so per-department figures are a single bincount instead of a group-by.
+    """
+
+    def __init__(
+        self,
+        employee_ids: List[str],
+        department_names: List[str],
+        departments: np.ndarray,
+        start_date: date,
+        statuses: np.ndarray,
+    ):
+        self.employee_ids = employee_ids
+        self.department_names = department_names
+        self.departments = departments
+        self.start_date = start_date
+        self.statuses = statuses
+        self.row_of = {employee_id: row for row, employee_id in enumerate(employee_ids)}
+
+    @property
+    def num_days(self) -> int:
+        return self.statuses.shape[1]
+
+    @property
+    def end_date(self) -> date:
+        return self.start_date + timedelta(days=self.num_days - 1)
+
+    def dates(self) -> List[str]:
+        return [(self.start_date + timedelta(days=offset)).isoformat() for offset in range(self.num_days)]
+
+    def rows(self, department: Optional[str] = None) -> np.ndarray:
+        """Status rows of all employees, or of one department's employees."""
+        if department is None:
+            return self.statuses
+        if department not in self.department_names:
+            return self.statuses[:0]
+        return self.statuses[self.departments == self.department_names.index(department)]
+
+    def set_statuses(self, changes: Iterable[Tuple[str, str, str]], overwrite: bool = True):
+        """
+        Write (employee_id, ISO date, status) changes into the matrix.
+
+        Changes outside the date range or for unknown employees are ignored.
+        With `overwrite` off only unmarked cells are filled.
+        """
+        for employee_id, day, status in changes:
+            row = self.row_of.get(employee_id)
+            column = (date.fromisoformat(day) - self.start_date).days
+            if row is None or not 0 <= column < self.num_days:
+                continue
+            if overwrite or self.statuses[row, column] == UNMARKED:
+                self.statuses[row, column] = STATUS_CODES.get(status, UNMARKED)
+
+    def add_employee(self, employee_id: str, department: str):
+        """Add an unmarked row for a new employee, keeping rows in employee ID order."""
+        if employee_id in self.row_of:
+            return
+        row = bisect.bisect_left(self.employee_ids, employee_id)
+        employee_departments = self._employee_departments()
+        employee_departments.insert(row, department)
+        self.employee_ids.insert(row, employee_id)
+        self.statuses = np.insert(self.statuses, row, UNMARKED, axis=0)
+        self._index(employee_departments)
+
+    def remove_employee(self, employee_id: str):
+        """Drop a deleted employee's row, and their department if it is left empty."""
+        row = self.row_of.get(employee_id)
+        if row is None:
+            return
+        employee_departments = self._employee_departments()
+        del employee_departments[row]
+        del self.employee_ids[row]
+        self.statuses = np.delete(self.statuses, row, axis=0)
+        self._index(employee_departments)
+
+    def _employee_departments(self) -> List[str]:
+        return [self.department_names[index] for index in self.departments]
+
+    def _index(self, employee_departments: List[str]):
+        """Rebuild the department and row lookups after rows were added or removed."""
+        self.department_names = sorted(set(employee_departments))
+        department_index = {name: index for index, name in enumerate(self.department_names)}
+        self.departments = np.array([department_index[name] for name in employee_departments], dtype=np.intp)
+        self.row_of = {employee_id: row for row, employee_id in enumerate(self.employee_ids)}
+
+
+async def build_matrix(start_date: date, end_date: date) -> AttendanceMatrix:
+    """Load a date range into a matrix in one streamed pass over the attendance records."""
+    started = time.perf_counter()
+    departments_by_employee = await get_employee_repository().departments()
+    employee_ids = sorted(departments_by_employee)
+    department_names = sorted(set(departments_by_employee.values()))
+    department_index = {name: index for index, name in enumerate(department_names)}
+
+    row_of = {employee_id: row for row, employee_id in enumerate(employee_ids)}
+    num_days = (end_date - start_date).days + 1
+    column_of = {
+        (start_date + timedelta(days=offset)).isoformat(): offset
+        for offset in range(num_days)
+    }
+
+    # Collect coordinates first and scatter them in one vectorized assignment.
+    # Lookups go through map() so the per-record work stays in C.
+    rows: List[int] = []
+    columns: List[int] = []
+    codes: List[int] = []
+    async for batch in get_attendance_repository().status_batches(start_date, end_date):
+        batch_employee_ids, batch_days, batch_statuses = zip(*batch)
+        rows.extend(map(row_of.get, batch_employee_ids, repeat(-1)))
+        columns.extend(map(column_of.__getitem__, batch_days))
+        codes.extend(map(STATUS_CODES.get, batch_statuses, repeat(UNMARKED)))
+        # Backends that never wait on I/O would otherwise hold the loop for the whole build
+        await asyncio.sleep(0)
+
+    rows = np.array(rows, dtype=np.intp)
+    # Records of employees deleted since the directory was read are skipped
+    known = rows >= 0
+    statuses = np.zeros((len(employee_ids), num_days), dtype=np.int8)
+    # Later rows win on repeated cells, matching the tier order of status_batches
+    statuses[rows[known], np.array(columns, dtype=np.intp)[known]] = np.array(codes, dtype=np.int8)[known]
+
+    departments = np.array(
+        [department_index[departments_by_employee[employee_id]] for employee_id in employee_ids],
+        dtype=np.intp,
+    )
+    metrics.set_gauge(
+        "analytics_matrix_build_ms",
+        round((time.perf_counter() - started) * 1000, 1),
+        tenant=get_current_tenant(),
+    )
+    return AttendanceMatrix(employee_ids, department_names, departments, start_date, statuses)
+
+
+# Never rebuilt on writes: attendance and employee writes are applied in place
+matrix_cache = VersionedCache(
+    "analytics_matrix",
+    settings.analytics_cache_max_entries,
+    version=lambda: 0,
+)
+
+
+async def get_matrix(start_date: date, end_date: date) -> AttendanceMatrix:
+    """Get the current tenant's matrix for a date range, building it if it is not cached."""
+    return await matrix_cache.get((start_date, end_date), lambda: build_matrix(start_date, end_date))
+
+
+def record_attendance(changes: List[Tuple[str, str, str]], overwrite: bool = True):
+    """
+    Apply attendance writes to the current tenant's cached matrices.
+
+    Call after every attendance write, with (employee_id, ISO date, status)
+    per record. Use `overwrite=False` for inserts that skip days already
+    marked, such as the end-of-day close.
+    """
+    matrix_cache.update(lambda matrix: matrix.set_statuses(changes, overwrite))
+
+
+def record_employee_created(employee_id: str, department: str):
+    """Add a new employee to the current tenant's cached matrices."""
+    matrix_cache.update(lambda matrix: matrix.add_employee(employee_id, department))
+
+
+def record_employee_deleted(employee_id: str):
+    """Remove a deleted employee from the current tenant's cached matrices."""
+    matrix_cache.update(lambda matrix: matrix.remove_employee(employee_id))
+
+
+def rate(numerator, denominator):
+    """Element-wise ratio that is NaN where the denominator is zero."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.true_divide(numerator, denominator)
+
+
+def department_rates(matrix: AttendanceMatrix) -> List[dict]:
+    """Present and absent days per department over the whole range."""
+    present = (matrix.statuses == PRESENT).sum(axis=1)
+    absent = (matrix.statuses == ABSENT).sum(axis=1)
+    num_departments = len(matrix.department_names)
+    headcount = np.bincount(matrix.departments, minlength=num_departments)
+    present_days = np.bincount(matrix.departments, weights=present, minlength=num_departments)
+    absent_days = np.bincount(matrix.departments, weights=absent, minlength=num_departments)
+    rates = rate(present_days, present_days + absent_days)
+
+    return [
+        {
+            "department": name,
+            "employees": int(headcount[index]),
+            "present_days": int(present_days[index]),
+            "absent_days": int(absent_days[index]),
+            "attendance_rate": percentage(rates[index]),
+        }
+        for index, name in enumerate(matrix.department_names)
+    ]
+
+
+def rolling_rates(matrix: AttendanceMatrix, window: int, department: Optional[str] = None) -> List[Optional[float]]:
+    """Attendance rate per day over the trailing `window` days (fewer at the start of the range)."""
+    rows = matrix.rows(department)
+    present = np.concatenate(([0], np.cumsum((rows == PRESENT).sum(axis=0))))
+    marked = np.concatenate(([0], np.cumsum((rows != UNMARKED).sum(axis=0))))
+    ends = np.arange(1, matrix.num_days + 1)
+    starts = np.maximum(ends - window, 0)
+    rates = rate(present[ends] - present[starts], marked[ends] - marked[starts])
+    return [percentage(value) for value in rates]
+
+
+def absent_streaks(statuses: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Longest and current (ending on the last day) run of absences per row."""
+    absent = (statuses == ABSENT).astype(np.int32)
+    if absent.shape[1] == 0:
+        empty = np.zeros(absent.shape[0], dtype=np.int32)
+        return empty, empty
+    running = np.cumsum(absent, axis=1)
+    # Total absences so far at each non-absent day, carried forward: subtracting
+    # it restarts the count after every break in the run
+    reset = np.maximum.accumulate(np.where(absent == 0, running, 0), axis=1)
+    runs = running - reset
+    return runs.max(axis=1), runs[:, -1]
+
+
+def chronic_absentees(matrix: AttendanceMatrix, min_absence_rate: float, min_streak: int) -> List[dict]:
+    """Employees whose absence rate or longest absence streak meets the thresholds."""
+    absent = (matrix.statuses == ABSENT).sum(axis=1)
+    marked = (matrix.statuses != UNMARKED).sum(axis=1)
+    absence_rates = np.nan_to_num(rate(absent, marked))
+    longest, current = absent_streaks(matrix.statuses)
+
+    flagged = np.flatnonzero(((absence_rates * 100 >= min_absence_rate) & (absent > 0)) | (longest >= min_streak))
+    flagged = flagged[np.lexsort((-longest[flagged], -absence_rates[flagged]))]
+
+    return [
+        {
+            "employee_id": matrix.employee_ids[row],
+            "department": matrix.department_names[matrix.departments[row]],
+            "absent_days": int(absent[row]),
+            "marked_days": int(marked[row]),
+            "absence_rate": percentage(absence_rates[row]),
+            "longest_absent_streak": int(longest[row]),
+            "current_absent_streak": int(current[row]),
+        }
+        for row in flagged
+    ]
+
+
+def weekday_rates(matrix: AttendanceMatrix, department: Optional[str] = None) -> List[dict]:
+    """Present and absent days per day of the week."""
+    rows = matrix.rows(department)
+    weekdays = (matrix.start_date.weekday() + np.arange(matrix.num_days)) % 7
+    present = np.bincount(weekdays, weights=(rows == PRESENT).sum(axis=0), minlength=7)
+    absent = np.bincount(weekdays, weights=(rows == ABSENT).sum(axis=0), minlength=7)
+    rates = rate(present, present + absent)
+
+    return [
+        {
+            "weekday": name,
+            "present_days": int(present[index]),
+            "absent_days": int(absent[index]),
+            "attendance_rate": percentage(rates[index]),
+        }
+        for index, name in enumerate(WEEKDAYS)
+    ]
+
+
+def percentage(value: float) -> Optional[float]:
+    """Round a 0-1 ratio to a percentage, or None when undefined."""
+    if np.isnan(value):
+        return None
+    return round(float(value) * 100, 1)
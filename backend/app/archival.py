@@ -0,0 +1,79 @@
+import asyncio
+import time
+from datetime import date
+from typing import Optional
+
+from app.cache import bump_data_version
+from app.config import get_settings
+from app.metrics import metrics
+from app.repositories import get_attendance_repository
+from app.tenancy import get_current_tenant, get_tenant_ids, tenant_context
+
+settings = get_settings()
+
+
+def archive_cutoff(today: date, months: int) -> date:
+    """First day of the month `months` months before `today`; older records are archived."""
+    month_index = today.year * 12 + (today.month - 1) - months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+async def archive_attendance(months: int, batch_size: int, today: Optional[date] = None) -> dict:
+    """
+    Move the current tenant's attendance older than `months` whole months to the archive tier.
+
+    Each batch is copied to the archive (replacing any earlier copy), the
+    watermark is advanced so reads start merging the archive, and only then is
+    the batch deleted from the hot tier. Records updated mid-move stay hot and
+    are picked up again on the next run, so the job is safe to interrupt.
+    """
+    repository = get_attendance_repository()
+    cutoff = archive_cutoff(today or date.today(), months)
+    started = time.perf_counter()
+    moved = 0
+    batches = 0
+
+    while True:
+        records = await repository.hot.find_before(cutoff, batch_size)
+        if not records:
+            break
+
+        await repository.archive.replace_many(records)
+        repository.advance_watermark(date.fromisoformat(records[-1]["date"]))
+        deleted = await repository.hot.delete_unchanged(records)
+
+        moved += deleted
+        batches += 1
+        if deleted < len(records):
+            # Whatever is left changed under us; leave it for the next run
+            break
+        # Let request handlers run between batches
+        await asyncio.sleep(0)
+
+    if moved:
+        bump_data_version()
+    metrics.inc("archival_records_moved_total", moved, tenant=get_current_tenant())
+
+    return {
+        "cutoff": cutoff.isoformat(),
+        "moved": moved,
+        "batches": batches,
+        "watermark": repository.watermark.isoformat() if repository.watermark else None,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+async def run_archival_periodically():
+    """Background task running the archival job for every tenant every `archive_interval_hours`."""
+    while True:
+        for tenant in get_tenant_ids():
+            with tenant_context(tenant):
+                try:
+                    report = await archive_attendance(settings.archive_after_months, settings.archive_batch_size)
+                    print(f"Attendance archival ({tenant}): {report}")
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    metrics.inc("archival_failures_total", tenant=tenant)
+                    print(f"Attendance archival ({tenant}) failed: {e}")
+        await asyncio.sleep(settings.archive_interval_hours * 3600)
@@ -0,0 +1,178 @@
+import asyncio
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional
+
+from app.metrics import metrics
+from app.tenancy import get_current_tenant
+
+
+class DataVersion:
+    """
+    Monotonic counter per tenant, bumped by every write path.
+
+    Caches key their entries on the current version, so a write invalidates
+    everything derived from earlier data without tracking individual keys,
+    and only for the tenant that wrote.
+    """
+
+    values: Dict[str, int] = {}
+
+
+def get_data_version() -> int:
+    """Get the current tenant's data version."""
+    return DataVersion.values.get(get_current_tenant(), 0)
+
+
+def bump_data_version():
+    """Mark the current tenant's cached data as stale. Call after any write."""
+    tenant = get_current_tenant()
+    DataVersion.values[tenant] = DataVersion.values.get(tenant, 0) + 1
+
+
+class EmployeeVersion:
+    """
+    Counter per tenant, bumped only when employees are created or deleted.
+
+    For caches derived from the set of employees, which would otherwise be
+    thrown away by every attendance write.
+    """
+
+    values: Dict[str, int] = {}
+
+
+def get_employee_version() -> int:
+    """Get the current tenant's employee version."""
+    return EmployeeVersion.values.get(get_current_tenant(), 0)
+
+
+def bump_employee_version():
+    """Mark the current tenant's employee-derived data (and all other cached data) as stale."""
+    tenant = get_current_tenant()
+    EmployeeVersion.values[tenant] = EmployeeVersion.values.get(tenant, 0) + 1
+    bump_data_version()
+
+
+class LRUCache:
+    """Size-bounded LRU cache for byte payloads."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[object]:
+        """Get a cached value and mark it as recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def set(self, key: Hashable, value: object, size: int):
+        """Store a value, evicting least recently used entries if needed."""
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self.total_bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (value, size)
+        self.total_bytes += size
+        while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted_size
+
+    def clear(self):
+        """Drop all entries."""
+        self._entries.clear()
+        self.total_bytes = 0
+
+
+class VersionedCache:
+    """
+    Values loaded on demand and kept until the current tenant's version changes.
+
+    Entries are keyed on a version (by default the data version, bumped by
+    every write), so a bump makes them unreachable and they simply age out.
+    Each tenant has its own entries, and concurrent requests for a missing
+    entry share one load instead of each running it.
+    """
+
+    def __init__(self, name: str, max_entries: int, version: Callable[[], int] = get_data_version):
+        self.name = name
+        self.max_entries = max_entries
+        self.version = version
+        self._entries: Dict[str, "OrderedDict[Hashable, asyncio.Future]"] = {}
+        # Writes to apply to values still loading, once they are loaded
+        self._pending: Dict[asyncio.Future, List[Callable[[object], None]]] = {}
+
+    def clear(self):
+        """Drop all entries of all tenants."""
+        self._entries.clear()
+
+    def update(self, apply: Callable[[object], None]):
+        """
+        Apply a write to the current tenant's loaded values in place.
+
+        For caches whose version does not cover every write. Entries still
+        loading get the write once their load finishes, since the load may
+        have read the data before it; `apply` must therefore be idempotent.
+        """
+        entries = self._entries.get(get_current_tenant())
+        if not entries:
+            return
+        version = self.version()
+        for versioned_key, future in list(entries.items()):
+            if versioned_key[1] != version:
+                continue
+            if future.done():
+                apply(future.result())
+            else:
+                self._pending.setdefault(future, []).append(apply)
+
+    def peek(self, key: Hashable) -> Optional[object]:
+        """Get the value for `key` if it is loaded, without loading it."""
+        entries = self._entries.get(get_current_tenant())
+        future = entries.get((key, self.version())) if entries else None
+        if future is None or not future.done():
+            return None
+        return future.result()
+
+    async def get(self, key: Hashable, load: Callable[[], Awaitable[object]]) -> object:
+        """Get the value for `key`, calling `load` if it is missing."""
+        tenant = get_current_tenant()
+        entries = self._entries.setdefault(tenant, OrderedDict())
+        versioned_key = (key, self.version())
+        future = entries.get(versioned_key)
+        if future is not None:
+            entries.move_to_end(versioned_key)
+            metrics.inc(f"{self.name}_cache_total", result="hit", tenant=tenant)
+            return await asyncio.shield(future)
+
+        metrics.inc(f"{self.name}_cache_total", result="miss", tenant=tenant)
+        future = asyncio.get_running_loop().create_future()
+        entries[versioned_key] = future
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+        try:
+            value = await load()
+        except asyncio.CancelledError:
+            entries.pop(versioned_key, None)
+            self._pending.pop(future, None)
+            future.cancel()
+            raise
+        except Exception as e:
+            entries.pop(versioned_key, None)
+            self._pending.pop(future, None)
+            future.set_exception(e)
+            # Mark it retrieved so a failure nobody else waited on is not logged as unhandled
+            future.exception()
+            raise
+        # In the order they were made, before anyone sees the value
+        for apply in self._pending.pop(future, ()):
+            apply(value)
+        future.set_result(value)
+        return value
@@ -0,0 +1,115 @@
+import asyncio
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict
+
+from app.analytics import record_attendance
+from app.cache import bump_data_version
+from app.config import get_settings
+from app.events import publish_dashboard_delta
+from app.metrics import metrics
+from app.models.attendance import AttendanceStatus
+from app.repositories import get_attendance_repository
+from app.tenancy import get_current_tenant, get_tenant_ids, tenant_context
+
+settings = get_settings()
+
+# Keep the scheduled run and manual triggers of a tenant from overlapping
+close_day_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+async def close_day(day: date, batch_size: int) -> dict:
+    """
+    Mark every employee of the current tenant without a record for `day` as Absent.
+
+    Unmarked employees are found with one anti-join query and inserted in
+    `insert_many` batches. Inserts that collide with a mark made meanwhile
+    are skipped by the unique (employee_id, date) index, so the job is
+    idempotent, and an interrupted run is finished by running it again.
+    """
+    async with close_day_locks[get_current_tenant()]:
+        repository = get_attendance_repository()
+        started = time.perf_counter()
+
+        employee_ids = await repository.unmarked_employee_ids(day)
+        now = datetime.utcnow()
+        inserted = 0
+        batches = 0
+        for offset in range(0, len(employee_ids), batch_size):
+            inserted += await repository.insert_many([
+                {
+                    "employee_id": employee_id,
+                    "date": day.isoformat(),
+                    "status": AttendanceStatus.ABSENT.value,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for employee_id in employee_ids[offset:offset + batch_size]
+            ])
+            batches += 1
+            # Let request handlers run between batches
+            await asyncio.sleep(0)
+
+        if inserted:
+            bump_data_version()
+            # Inserts that collided with a mark made meanwhile were skipped, so only fill unmarked days
+            record_attendance(
+                [(employee_id, day.isoformat(), AttendanceStatus.ABSENT.value) for employee_id in employee_ids],
+                overwrite=False,
+            )
+            if day == date.today():
+                publish_dashboard_delta(absent_today=inserted)
+        metrics.inc("close_day_absent_inserted_total", inserted, tenant=get_current_tenant())
+
+        return {
+            "date": day,
+            "unmarked": len(employee_ids),
+            "inserted": inserted,
+            "skipped": len(employee_ids) - inserted,
+            "batches": batches,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+
+def seconds_until(cutoff: str, now: datetime) -> float:
+    """Seconds from `now` until the next HH:MM cutoff (local time)."""
+    hour, minute = (int(part) for part in cutoff.split(":"))
+    next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if next_run <= now:
+        next_run += timedelta(days=1)
+    return (next_run - now).total_seconds()
+
+
+def past_cutoff(cutoff: str, now: datetime) -> bool:
+    """Check whether today's HH:MM cutoff (local time) has passed."""
+    hour, minute = (int(part) for part in cutoff.split(":"))
+    return now >= now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+
+async def close_day_for_all_tenants(day: date):
+    """Close a day for every tenant, logging failures instead of raising them."""
+    for tenant in get_tenant_ids():
+        with tenant_context(tenant):
+            try:
+                report = await close_day(day, settings.close_day_batch_size)
+                print(f"End-of-day close ({tenant}): {report}")
+            except Exception as e:
+                metrics.inc("close_day_failures_total", tenant=tenant)
+                print(f"End-of-day close ({tenant}) failed: {e}")
+
+
+async def run_close_day_daily():
+    """
+    Background task closing the day for every tenant at `close_day_cutoff` every day.
+
+    A server (re)started after the cutoff closes today straight away, since
+    the run it missed would otherwise never happen; closing is idempotent.
+    Days missed entirely while the server was down are not caught up, and
+    can be closed with POST /api/attendance/close-day?date=...
+    """
+    if past_cutoff(settings.close_day_cutoff, datetime.now()):
+        await close_day_for_all_tenants(date.today())
+    while True:
+        await asyncio.sleep(seconds_until(settings.close_day_cutoff, datetime.now()))
+        await close_day_for_all_tenants(date.today())
@@ -12,6 +12,60 @@ class Settings(BaseSettings):
     # MongoDB settings - defaults to localhost, override with MONGODB_URL env var
     mongodb_url: str = "mongodb://localhost:27017"
     database_name: str = "hrms_lite"
+
+    # Multi-tenancy - each listed tenant gets its own database
+    # (<database_name>_<tenant>) over the shared connection pool, plus its own
+    # caches. The tenant comes from the X-Tenant-ID header, a `tenant` query
+    # parameter (EventSource cannot send headers) or the subdomain of
+    # tenant_base_domain; requests naming none use the default tenant, which
+    # keeps database_name. An empty list means single-tenant.
+    default_tenant: str = "default"
+    tenants: List[str] = []
+    tenant_header: str = "X-Tenant-ID"
+    tenant_base_domain: str = ""
+
+    # Storage backend - "mongo" for MongoDB, "memory" for in-process tests and benchmarks
+    storage_backend: str = "mongo"
+    
+    # Attendance archival - records older than this many months move to the
+    # archive collection in batches (0 disables the background job)
+    archive_after_months: int = 0
+    archive_batch_size: int = 1000
+    archive_interval_hours: float = 24
+    
+    # End-of-day close - employees without a mark by the cutoff (server local
+    # time, HH:MM) are recorded Absent in batches
+    close_day_enabled: bool = False
+    close_day_cutoff: str = "18:00"
+    close_day_batch_size: int = 500
+    
+    # Delta sync - deletion markers are kept this long; older sync tokens get a full snapshot
+    sync_tombstone_retention_days: int = 30
+    
+    # Server-Sent Events - per-client buffer (slow clients beyond it are dropped)
+    events_buffer_size: int = 100
+    events_heartbeat_seconds: float = 15
+    events_max_subscribers: int = 1000
+    
+    # Analytics - attendance matrices kept in memory per tenant and date range
+    # (about employees x days bytes each); any write invalidates them
+    analytics_cache_max_entries: int = 4
+    analytics_default_days: int = 90
+    analytics_max_days: int = 366 * 3
+    
+    # Admin API - token expected in the X-Admin-Token header of /api/admin
+    # requests (empty disables the admin API and request profiling)
+    admin_token: str = ""
+    
+    # Request profiling - a request opts in with X-Profile: 1 plus a valid
+    # admin token, or the admin toggle profiles a random share of requests.
+    # Profiled requests are sampled from a background thread every interval.
+    profiling_interval_ms: float = 5
+    profiling_max_profiles: int = 50
+    profiling_exclude_paths: List[str] = [
+        "/api/events",
+        "/api/admin",
+    ]
     
     # CORS settings - allow common development ports
     cors_origins: List[str] = [
@@ -20,7 +74,60 @@ class Settings(BaseSettings):
         "http://localhost:5175",
         "http://localhost:3000",
     ]
-    
+
+    # Admission control - per route class concurrency limits and wait queues.
+    # Requests beyond limit + queue (or waiting longer than the timeout) get a 503.
+    admission_enabled: bool = True
+    admission_read_concurrency: int = 64
+    admission_read_queue: int = 128
+    admission_write_concurrency: int = 16
+    admission_write_queue: int = 32
+    admission_heavy_concurrency: int = 4
+    admission_heavy_queue: int = 8
+    admission_queue_timeout: float = 2.0
+    admission_retry_after: int = 1
+    admission_heavy_paths: List[str] = [
+        "/api/attendance/summary",
+        "/api/attendance/close-day",
+        "/api/analytics",
+        "/api/bootstrap/dashboard",
+    ]
+    # POST endpoints that only read (classified as reads, not writes)
+    admission_read_paths: List[str] = [
+        "/api/employees/batch-get",
+    ]
+    admission_exempt_paths: List[str] = [
+        "/",
+        "/health",
+        "/metrics",
+        "/api/events",
+        "/docs",
+        "/redoc",
+        "/openapi.json",
+    ]
+
+    # Response compression - negotiated zstd/br/gzip above a size threshold.
+    # GET responses on the cacheable paths are kept compressed in memory and
+    # served again until the next write bumps the data version.
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 5
+    compression_zstd_level: int = 3
+    # Bodies at least this large are compressed in a worker thread, not on the event loop
+    compression_thread_minimum_size: int = 64 * 1024
+    compression_cache_paths: List[str] = [
+        "/api/dashboard/stats",
+        "/api/attendance/summary",
+        "/api/employees",
+        "/api/attendance",
+        "/api/bootstrap/dashboard",
+        "/api/bootstrap/attendance",
+    ]
+    # Cache limits apply per tenant, so one tenant cannot evict another's entries
+    compression_cache_max_entries: int = 256
+    compression_cache_max_bytes: int = 32 * 1024 * 1024
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
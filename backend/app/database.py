@@ -1,5 +1,7 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from typing import Optional
 from app.config import get_settings
+from app.tenancy import get_current_tenant
 import certifi
 import ssl
 
@@ -36,6 +38,8 @@ class Database:
             print("Connected to MongoDB (with relaxed SSL)")
         
         print(f"Database: {settings.database_name}")
+        if settings.tenants:
+            print(f"Tenants: {', '.join(settings.tenants)}")
     
     @classmethod
     async def disconnect(cls):
@@ -45,19 +49,28 @@ class Database:
             print("Disconnected from MongoDB")
     
     @classmethod
-    def get_database(cls):
-        """Get the database instance."""
-        return cls.client[settings.database_name]
+    def get_database(cls, tenant: Optional[str] = None):
+        """Get the database of a tenant (default: the current tenant). All tenants share the client's pool."""
+        return cls.client[tenant_database_name(tenant or get_current_tenant())]
     
     @classmethod
-    def get_collection(cls, collection_name: str):
-        """Get a collection from the database."""
-        return cls.get_database()[collection_name]
+    def get_collection(cls, collection_name: str, tenant: Optional[str] = None):
+        """Get a collection from a tenant's database (default: the current tenant)."""
+        return cls.get_database(tenant)[collection_name]
+
+
+def tenant_database_name(tenant: str) -> str:
+    """Get the database name of a tenant. The default tenant keeps `database_name`."""
+    if tenant == settings.default_tenant:
+        return settings.database_name
+    return f"{settings.database_name}_{tenant}"
 
 
 # Collection names
 EMPLOYEES_COLLECTION = "employees"
 ATTENDANCE_COLLECTION = "attendance"
+ATTENDANCE_ARCHIVE_COLLECTION = "attendance_archive"
+TOMBSTONES_COLLECTION = "tombstones"
 
 
 def get_employees_collection():
@@ -70,3 +83,11 @@ def get_attendance_collection():
     return Database.get_collection(ATTENDANCE_COLLECTION)
 
 
+def get_attendance_archive_collection():
+    """Get the collection holding archived attendance."""
+    return Database.get_collection(ATTENDANCE_ARCHIVE_COLLECTION)
+
+
+def get_tombstones_collection():
+    """Get the collection of deletion markers used by delta sync."""
+    return Database.get_collection(TOMBSTONES_COLLECTION)
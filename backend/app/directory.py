@@ -0,0 +1,35 @@
+from typing import Dict, List, Optional
+
+from app.cache import VersionedCache, get_employee_version
+from app.repositories import get_employee_repository
+
+
+class EmployeeDirectory:
+    """
+    All employees of a tenant, newest first, with lookups by employee_id.
+
+    Shared between requests, so the documents must be treated as read-only.
+    """
+
+    def __init__(self, employees: List[dict]):
+        self.employees = employees
+        self.by_id: Dict[str, dict] = {employee["employee_id"]: employee for employee in employees}
+        self.names: Dict[str, str] = {employee["employee_id"]: employee["full_name"] for employee in employees}
+
+
+# Attendance writes leave employees untouched, so only employee changes reload it
+directory_cache = VersionedCache("employee_directory", max_entries=1, version=get_employee_version)
+
+
+async def load_employee_directory() -> EmployeeDirectory:
+    return EmployeeDirectory(await get_employee_repository().list_all())
+
+
+async def get_employee_directory() -> EmployeeDirectory:
+    """Get the current tenant's employees, reading them at most once per employee version."""
+    return await directory_cache.get(None, load_employee_directory)
+
+
+def peek_employee_directory() -> Optional[EmployeeDirectory]:
+    """Get the current tenant's employee directory if it is loaded, without loading it."""
+    return directory_cache.peek(None)
@@ -0,0 +1,125 @@
+import asyncio
+import json
+from datetime import date
+from typing import AsyncIterator, Dict, Optional, Set
+
+from fastapi.encoders import jsonable_encoder
+
+from app.config import get_settings
+from app.metrics import metrics
+from app.models.attendance import AttendanceStatus
+from app.tenancy import get_current_tenant
+
+settings = get_settings()
+
+
+class Subscriber:
+    """One connected event stream with a bounded buffer."""
+
+    def __init__(self, broker: "EventBroker"):
+        self.broker = broker
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=broker.buffer_size)
+
+
+class EventBroker:
+    """
+    In-process fan-out of one tenant's change events to Server-Sent Events clients.
+
+    Publishing never waits: each subscriber has a bounded queue, and a client
+    too slow to drain it is disconnected instead of holding up the writer.
+    """
+
+    def __init__(self, tenant: str, buffer_size: int):
+        self.tenant = tenant
+        self.buffer_size = buffer_size
+        self.subscribers: Set[Subscriber] = set()
+
+    def has_subscribers(self) -> bool:
+        return bool(self.subscribers)
+
+    def subscribe(self) -> Subscriber:
+        subscriber = Subscriber(self)
+        self.subscribers.add(subscriber)
+        metrics.set_gauge("events_subscribers", len(self.subscribers), tenant=self.tenant)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
+        metrics.set_gauge("events_subscribers", len(self.subscribers), tenant=self.tenant)
+
+    def publish(self, event: str, data: dict):
+        """Queue an event for every subscriber without blocking."""
+        if not self.subscribers:
+            return
+        message = f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+        for subscriber in list(self.subscribers):
+            try:
+                subscriber.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self.drop(subscriber)
+        metrics.inc("events_published_total", event=event, tenant=self.tenant)
+
+    def drop(self, subscriber: Subscriber):
+        """Disconnect a slow subscriber, discarding what it has not read."""
+        self.unsubscribe(subscriber)
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+        metrics.inc("events_dropped_subscribers_total", tenant=self.tenant)
+
+
+brokers: Dict[str, EventBroker] = {}
+
+
+def get_broker() -> EventBroker:
+    """Get the current tenant's broker, so events never reach another tenant's clients."""
+    tenant = get_current_tenant()
+    broker = brokers.get(tenant)
+    if broker is None:
+        broker = brokers[tenant] = EventBroker(tenant, settings.events_buffer_size)
+    return broker
+
+
+async def event_stream(subscriber: Subscriber, heartbeat_seconds: float) -> AsyncIterator[str]:
+    """Yield SSE messages for a subscriber, with heartbeat comments while idle."""
+    try:
+        # Tell EventSource how long to wait before reconnecting
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(subscriber.queue.get(), heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            if message is None:
+                # Dropped for falling behind; the client reconnects and refetches
+                break
+            yield message
+    finally:
+        subscriber.broker.unsubscribe(subscriber)
+
+
+def publish_dashboard_delta(total_employees: int = 0, present_today: int = 0, absent_today: int = 0):
+    """Publish changes to today's dashboard counters."""
+    delta = {
+        "total_employees": total_employees,
+        "present_today": present_today,
+        "absent_today": absent_today,
+    }
+    delta = {key: value for key, value in delta.items() if value}
+    if delta:
+        get_broker().publish("dashboard", {"date": date.today().isoformat(), **delta})
+
+
+def status_delta(previous: Optional[str], current: Optional[str]) -> dict:
+    """Dashboard counter changes for today's status moving from `previous` to `current`."""
+    counters = {
+        AttendanceStatus.PRESENT.value: "present_today",
+        AttendanceStatus.ABSENT.value: "absent_today",
+    }
+    delta = {"present_today": 0, "absent_today": 0}
+    if previous in counters:
+        delta[counters[previous]] -= 1
+    if current in counters:
+        delta[counters[current]] += 1
+    return delta
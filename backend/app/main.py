@@ -1,11 +1,29 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Header
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from datetime import date
+from typing import Optional
+import asyncio
 
 from app.config import get_settings
-from app.database import Database, get_employees_collection, get_attendance_collection
-from app.routes import employees_router, attendance_router
+from app.repositories import (
+    connect_storage,
+    disconnect_storage,
+    get_employee_repository,
+    get_attendance_repository,
+)
+from app.routes import employees_router, attendance_router, sync_router, events_router, analytics_router, bootstrap_router, admin_router
+from app.middleware import (
+    AdmissionControlMiddleware,
+    CompressionMiddleware,
+    ProfilingMiddleware,
+    TenantMiddleware,
+)
+from app.metrics import metrics
+from app.routes.admin import is_admin_token
+from app.archival import run_archival_periodically
+from app.close_day import run_close_day_daily
+from app.tenancy import get_current_tenant
 
 settings = get_settings()
 
@@ -14,10 +32,17 @@ settings = get_settings()
 async def lifespan(app: FastAPI):
     """Application lifespan manager for startup and shutdown events."""
     # Startup
-    await Database.connect()
+    await connect_storage()
+    background_tasks = []
+    if settings.archive_after_months > 0:
+        background_tasks.append(asyncio.create_task(run_archival_periodically()))
+    if settings.close_day_enabled:
+        background_tasks.append(asyncio.create_task(run_close_day_daily()))
     yield
     # Shutdown
-    await Database.disconnect()
+    for task in background_tasks:
+        task.cancel()
+    await disconnect_storage()
 
 
 # Create FastAPI application
@@ -28,6 +53,22 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Shed excess load before it queues on the Mongo pool. Added before CORS so
+# that CORS stays outermost and 503 responses remain readable by the browser.
+app.add_middleware(AdmissionControlMiddleware, settings=settings)
+
+# Compress responses and serve cached hot payloads. Sits outside admission
+# control so cache hits never take a slot.
+app.add_middleware(CompressionMiddleware, settings=settings)
+
+# Profile opted-in requests, including time spent compressing and queued
+# for admission. A no-op unless ADMIN_TOKEN is set.
+app.add_middleware(ProfilingMiddleware, settings=settings)
+
+# Resolve the tenant first, so the response cache, repositories and metrics
+# below all see it. Inside CORS so unknown-tenant errors stay readable.
+app.add_middleware(TenantMiddleware, settings=settings)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -40,6 +81,11 @@ app.add_middleware(
 # Include routers
 app.include_router(employees_router)
 app.include_router(attendance_router)
+app.include_router(sync_router)
+app.include_router(events_router)
+app.include_router(analytics_router)
+app.include_router(bootstrap_router)
+app.include_router(admin_router)
 
 
 @app.get("/", tags=["Health"])
@@ -58,28 +104,30 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", tags=["Health"])
+async def get_metrics(x_admin_token: Optional[str] = Header(None, description="Admin token, for every tenant's series")):
+    """In-process metrics (admission queue depth, rejections, ...) of the caller's tenant."""
+    if is_admin_token(x_admin_token):
+        return metrics.snapshot()
+    return metrics.snapshot(tenant=get_current_tenant())
+
+
 @app.get("/api/dashboard/stats", tags=["Dashboard"])
 async def get_dashboard_stats():
     """Get dashboard statistics."""
-    employees_collection = get_employees_collection()
-    attendance_collection = get_attendance_collection()
+    employee_repository = get_employee_repository()
+    attendance_repository = get_attendance_repository()
     
     # Get total employees count
-    total_employees = await employees_collection.count_documents({})
-    
-    # Get today's date in ISO format
-    today = date.today().isoformat()
+    total_employees = await employee_repository.count()
     
-    # Count present and absent today
-    present_today = await attendance_collection.count_documents({
-        "date": today,
-        "status": "Present"
-    })
+    # Get today's date
+    today = date.today()
     
-    absent_today = await attendance_collection.count_documents({
-        "date": today,
-        "status": "Absent"
-    })
+    # Count present and absent today in one grouped query
+    counts = await attendance_repository.count_by_status(today)
+    present_today = counts.get("Present", 0)
+    absent_today = counts.get("Absent", 0)
     
     # Calculate attendance rate (if there are attendance records today)
     attendance_rate = 0.0
@@ -92,6 +140,6 @@ async def get_dashboard_stats():
         "present_today": present_today,
         "absent_today": absent_today,
         "attendance_rate": attendance_rate,
-        "date": today
+        "date": today.isoformat()
     }
 
@@ -0,0 +1,56 @@
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    """In-process registry of counters and gauges exposed at /metrics."""
+
+    def __init__(self):
+        self.counters: Dict[str, Dict[LabelSet, float]] = defaultdict(dict)
+        self.gauges: Dict[str, Dict[LabelSet, float]] = defaultdict(dict)
+
+    @staticmethod
+    def _labels(labels: dict) -> LabelSet:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Increment a counter."""
+        series = self.counters[name]
+        key = self._labels(labels)
+        series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        """Set a gauge to its current value."""
+        self.gauges[name][self._labels(labels)] = value
+
+    def snapshot(self, tenant: Optional[str] = None) -> dict:
+        """
+        Return metrics as JSON-serializable series.
+
+        With `tenant`, series labelled with any other tenant are left out;
+        process-wide series without a tenant label are always included.
+        """
+        def visible(labels: LabelSet) -> bool:
+            return tenant is None or dict(labels).get("tenant", tenant) == tenant
+
+        def dump(metrics: Dict[str, Dict[LabelSet, float]]) -> dict:
+            dumped = {
+                name: [
+                    {"labels": dict(labels), "value": value}
+                    for labels, value in series.items()
+                    if visible(labels)
+                ]
+                for name, series in metrics.items()
+            }
+            return {name: series for name, series in dumped.items() if series}
+
+        return {
+            "counters": dump(self.counters),
+            "gauges": dump(self.gauges),
+        }
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,6 @@
+from app.middleware.admission import AdmissionControlMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.tenant import TenantMiddleware
+
+__all__ = ["AdmissionControlMiddleware", "CompressionMiddleware", "ProfilingMiddleware", "TenantMiddleware"]
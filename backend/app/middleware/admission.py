@@ -0,0 +1,165 @@
+import asyncio
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+
+from app.config import Settings
+from app.metrics import metrics
+
+
+# Route classes - each gets its own concurrency limit and wait queue
+READ = "read"
+WRITE = "write"
+HEAVY = "heavy"
+
+SAFE_METHODS = {"GET", "HEAD"}
+
+
+class AdmissionLimiter:
+    """Concurrency limiter with a bounded FIFO wait queue."""
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+
+    def _report(self):
+        metrics.set_gauge("admission_in_flight", self.in_flight, route_class=self.name)
+        metrics.set_gauge("admission_queue_depth", len(self.waiters), route_class=self.name)
+
+    async def acquire(self) -> Optional[str]:
+        """
+        Wait for a slot.
+
+        Returns None once admitted, otherwise the rejection reason
+        ("queue_full" or "queue_timeout").
+        """
+        if self.in_flight < self.max_concurrency and not self.waiters:
+            self.in_flight += 1
+            self._report()
+            return None
+
+        if len(self.waiters) >= self.max_queue:
+            return "queue_full"
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        self._report()
+        try:
+            await asyncio.wait((waiter,), timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            # Client went away - hand back a slot we were given, or leave the queue
+            if waiter.done():
+                self.release()
+            else:
+                waiter.cancel()
+                self._discard(waiter)
+            raise
+
+        if waiter.done():
+            return None
+
+        waiter.cancel()
+        self._discard(waiter)
+        return "queue_timeout"
+
+    def release(self):
+        """Free a slot, handing it directly to the oldest waiter if any."""
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                # Slot is transferred, so in_flight stays the same
+                waiter.set_result(None)
+                self._report()
+                return
+        self.in_flight -= 1
+        self._report()
+
+    def _discard(self, waiter: asyncio.Future):
+        try:
+            self.waiters.remove(waiter)
+        except ValueError:
+            pass
+        self._report()
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware that sheds load before requests reach the Mongo pool.
+
+    Requests are classified as cheap reads, writes, or heavy aggregates. Each
+    class has its own concurrency limit and bounded wait queue; anything beyond
+    that is rejected immediately with 503 and a Retry-After header instead of
+    piling up behind the connection pool.
+    """
+
+    def __init__(self, app, settings: Settings):
+        self.app = app
+        self.enabled = settings.admission_enabled
+        self.retry_after = settings.admission_retry_after
+        self.heavy_paths = tuple(settings.admission_heavy_paths)
+        self.read_paths = set(settings.admission_read_paths)
+        self.exempt_paths = set(settings.admission_exempt_paths)
+        self.limiters: Dict[str, AdmissionLimiter] = {
+            READ: AdmissionLimiter(
+                READ,
+                settings.admission_read_concurrency,
+                settings.admission_read_queue,
+                settings.admission_queue_timeout,
+            ),
+            WRITE: AdmissionLimiter(
+                WRITE,
+                settings.admission_write_concurrency,
+                settings.admission_write_queue,
+                settings.admission_queue_timeout,
+            ),
+            HEAVY: AdmissionLimiter(
+                HEAVY,
+                settings.admission_heavy_concurrency,
+                settings.admission_heavy_queue,
+                settings.admission_queue_timeout,
+            ),
+        }
+
+    def classify(self, method: str, path: str) -> Optional[str]:
+        """Get the route class for a request, or None if it is not limited."""
+        if method == "OPTIONS" or path in self.exempt_paths:
+            return None
+        if path.startswith(self.heavy_paths):
+            return HEAVY
+        if method in SAFE_METHODS or path in self.read_paths:
+            return READ
+        return WRITE
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route_class = self.classify(scope["method"], scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiters[route_class]
+        rejection = await limiter.acquire()
+        if rejection:
+            metrics.inc("admission_rejected_total", route_class=route_class, reason=rejection)
+            response = JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"detail": "Server is busy, please retry shortly"},
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        metrics.inc("admission_admitted_total", route_class=route_class)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
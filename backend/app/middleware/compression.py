@@ -0,0 +1,276 @@
+import gzip
+import hashlib
+from datetime import date
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.cache import LRUCache, get_data_version
+from app.config import Settings
+from app.metrics import metrics
+from app.tenancy import get_current_tenant
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+
+IDENTITY = "identity"
+
+# Content types worth compressing. Event streams must never be buffered.
+COMPRESSIBLE_TYPES = ("application/json", "text/html", "text/plain", "text/css", "application/javascript")
+
+
+def build_codecs(settings: Settings) -> Dict[str, Callable[[bytes], bytes]]:
+    """Get the available encoders, in server preference order."""
+    codecs: Dict[str, Callable[[bytes], bytes]] = {}
+
+    if zstandard is not None:
+        zstd_compressor = zstandard.ZstdCompressor(level=settings.compression_zstd_level)
+        codecs["zstd"] = zstd_compressor.compress
+
+    if brotli is not None:
+        quality = settings.compression_brotli_quality
+        codecs["br"] = lambda data: brotli.compress(data, quality=quality, mode=brotli.MODE_TEXT)
+
+    level = settings.compression_gzip_level
+    codecs["gzip"] = lambda data: gzip.compress(data, compresslevel=level, mtime=0)
+    return codecs
+
+
+def negotiate_encoding(accept_encoding: str, available) -> Optional[str]:
+    """Pick the encoding with the highest q-value, breaking ties by server preference."""
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+class CachedResponse(NamedTuple):
+    """A fully rendered response body for one content encoding."""
+
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    etag: str
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware for negotiated zstd/br/gzip compression.
+
+    GET responses on the cacheable paths are kept in a per-tenant LRU cache,
+    keyed on the data version, both as raw JSON and per content encoding.
+    Repeat hits skip the route handler (so no Mongo query or serialization)
+    and the compressor, and conditional requests get a 304 via the weak ETag.
+    """
+
+    def __init__(self, app, settings: Settings):
+        self.app = app
+        self.enabled = settings.compression_enabled
+        self.minimum_size = settings.compression_minimum_size
+        self.thread_minimum_size = settings.compression_thread_minimum_size
+        self.cache_paths = set(settings.compression_cache_paths)
+        self.codecs = build_codecs(settings)
+        self.cache_max_entries = settings.compression_cache_max_entries
+        self.cache_max_bytes = settings.compression_cache_max_bytes
+        self.caches: Dict[str, LRUCache] = {}
+
+    @property
+    def cache(self) -> LRUCache:
+        """The current tenant's cache; tenants never evict each other's entries."""
+        tenant = get_current_tenant()
+        cache = self.caches.get(tenant)
+        if cache is None:
+            cache = self.caches[tenant] = LRUCache(self.cache_max_entries, self.cache_max_bytes)
+        return cache
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""), self.codecs)
+        if_none_match = request_headers.get("if-none-match")
+
+        cache_key = None
+        if scope["method"] == "GET" and scope["path"] in self.cache_paths:
+            cache_key = (
+                scope["path"],
+                scope["query_string"],
+                get_data_version(),
+                date.today().isoformat(),
+            )
+            cached = await self.lookup(cache_key, encoding)
+            if cached is not None:
+                metrics.inc("response_cache_hits_total", path=scope["path"], tenant=get_current_tenant())
+                await self.send_cached(send, cached, if_none_match)
+                return
+            metrics.inc("response_cache_misses_total", path=scope["path"], tenant=get_current_tenant())
+
+        responder = _CompressionResponder(self, send, encoding, cache_key, if_none_match)
+        await self.app(scope, receive, responder.send)
+
+    async def encode(self, body: bytes, encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+        """Compress a body if it is large enough and the client accepts it."""
+        if encoding is None or len(body) < self.minimum_size:
+            return body, None
+        if len(body) >= self.thread_minimum_size:
+            # zlib, brotli and zstandard release the GIL, so other requests keep running meanwhile
+            compressed = await anyio.to_thread.run_sync(self.codecs[encoding], body)
+        else:
+            compressed = self.codecs[encoding](body)
+        metrics.inc("compression_bytes_in_total", len(body), encoding=encoding)
+        metrics.inc("compression_bytes_out_total", len(compressed), encoding=encoding)
+        return compressed, encoding
+
+    async def lookup(self, cache_key: tuple, encoding: Optional[str]) -> Optional[CachedResponse]:
+        """Get a cached response, compressing the cached raw body on demand."""
+        if encoding is not None:
+            cached = self.cache.get(cache_key + (encoding,))
+            if cached is not None:
+                return cached
+
+        raw = self.cache.get(cache_key + (IDENTITY,))
+        if raw is None or encoding is None:
+            return raw
+
+        body, used_encoding = await self.encode(raw.body, encoding)
+        if used_encoding is None:
+            return raw
+        headers = MutableHeaders(raw=list(raw.headers))
+        headers["content-encoding"] = used_encoding
+        cached = raw._replace(headers=headers.raw, body=body)
+        self.cache.set(cache_key + (encoding,), cached, len(body))
+        return cached
+
+    async def send_cached(self, send, cached: CachedResponse, if_none_match: Optional[str]):
+        """Send a cached response, or a 304 if the client already has it."""
+        if if_none_match and etag_matches(if_none_match, cached.etag):
+            await send_not_modified(send, cached.etag)
+            return
+
+        headers = MutableHeaders(raw=list(cached.headers))
+        headers["content-length"] = str(len(cached.body))
+        await send({"type": "http.response.start", "status": cached.status, "headers": headers.raw})
+        await send({"type": "http.response.body", "body": cached.body})
+
+
+async def send_not_modified(send, etag: str):
+    """Send an empty 304 response."""
+    await send({
+        "type": "http.response.start",
+        "status": 304,
+        "headers": [(b"etag", etag.encode("latin-1")), (b"vary", b"Accept-Encoding")],
+    })
+    await send({"type": "http.response.body", "body": b""})
+
+
+class _CompressionResponder:
+    """Wraps `send` to buffer, compress and optionally cache one response."""
+
+    def __init__(self, middleware: CompressionMiddleware, send, encoding: Optional[str], cache_key: Optional[tuple], if_none_match: Optional[str]):
+        self.middleware = middleware
+        self.downstream = send
+        self.encoding = encoding
+        self.cache_key = cache_key
+        self.if_none_match = if_none_match
+        self.start_message = None
+        self.passthrough = False
+        self.chunks: List[bytes] = []
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            if "content-encoding" in headers or not content_type.startswith(COMPRESSIBLE_TYPES):
+                self.passthrough = True
+                await self.downstream(message)
+                return
+            self.start_message = message
+            return
+
+        if self.passthrough or message["type"] != "http.response.body":
+            await self.downstream(message)
+            return
+
+        self.chunks.append(message.get("body", b""))
+        if message.get("more_body", False):
+            return
+        await self.finish()
+
+    async def finish(self):
+        body = b"".join(self.chunks)
+        status = self.start_message["status"]
+        headers = MutableHeaders(raw=list(self.start_message["headers"]))
+        headers.add_vary_header("Accept-Encoding")
+
+        etag = None
+        if self.cache_key is not None and status == 200:
+            etag = 'W/"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+            headers["etag"] = etag
+            self.middleware.cache.set(
+                self.cache_key + (IDENTITY,),
+                CachedResponse(status, self._cacheable_headers(headers), body, etag),
+                len(body),
+            )
+            if self.if_none_match and etag_matches(self.if_none_match, etag):
+                await send_not_modified(self.downstream, etag)
+                return
+
+        payload, encoding = await self.middleware.encode(body, self.encoding)
+        if encoding is not None:
+            headers["content-encoding"] = encoding
+            if etag is not None:
+                self.middleware.cache.set(
+                    self.cache_key + (encoding,),
+                    CachedResponse(status, self._cacheable_headers(headers), payload, etag),
+                    len(payload),
+                )
+        headers["content-length"] = str(len(payload))
+
+        await self.downstream({**self.start_message, "headers": headers.raw})
+        await self.downstream({"type": "http.response.body", "body": payload})
+
+    @staticmethod
+    def _cacheable_headers(headers: MutableHeaders) -> List[Tuple[bytes, bytes]]:
+        return [(key, value) for key, value in headers.raw if key != b"content-length"]
@@ -0,0 +1,91 @@
+import asyncio
+import hmac
+import random
+import sys
+
+from starlette.datastructures import MutableHeaders
+
+from app.config import Settings
+from app.metrics import metrics
+from app.profiling import (
+    Profile,
+    ProfilingToggle,
+    current_profile,
+    install_task_factory,
+    profile_store,
+    sampler,
+    uninstall_task_factory,
+)
+from app.tenancy import get_current_tenant
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles opted-in requests with a sampling profiler.
+
+    Requests are profiled when they carry `X-Profile: 1` and a valid
+    `X-Admin-Token`, or are picked at random while the admin toggle is on.
+    Everything else passes straight through; without an admin token
+    configured the middleware does nothing at all.
+    """
+
+    def __init__(self, app, settings: Settings):
+        self.app = app
+        self.admin_token = settings.admin_token.encode("latin-1")
+        self.enabled = bool(settings.admin_token)
+        self.exclude_paths = tuple(settings.profiling_exclude_paths)
+
+    def wants_profile(self, scope) -> bool:
+        """Check whether a request opted in, or was picked by the toggle."""
+        path = scope["path"]
+        if path.startswith(self.exclude_paths):
+            return False
+
+        profile_header = token = None
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                profile_header = value
+            elif name == b"x-admin-token":
+                token = value
+        if profile_header in (b"1", b"true") and token and hmac.compare_digest(token, self.admin_token):
+            return True
+
+        return (
+            ProfilingToggle.enabled
+            and path.startswith(ProfilingToggle.path_prefix)
+            and random.random() < ProfilingToggle.sample_rate
+        )
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http" or not self.wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        loop = asyncio.get_running_loop()
+        profile = Profile(
+            scope["method"],
+            scope["path"],
+            get_current_tenant(),
+            asyncio.current_task(),
+            sys._getframe(),
+        )
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+                MutableHeaders(scope=message).append("X-Profile-Id", str(profile.id))
+            await send(message)
+
+        token = current_profile.set(profile)
+        install_task_factory(loop)
+        sampler.start(profile)
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            sampler.stop(profile)
+            current_profile.reset(token)
+            if not sampler.is_active():
+                uninstall_task_factory(loop)
+            profile.finish()
+            profile_store.add(profile)
+            metrics.inc("profiled_requests_total", tenant=profile.tenant)
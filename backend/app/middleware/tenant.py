@@ -0,0 +1,66 @@
+from typing import Optional
+from urllib.parse import parse_qs
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+
+from app.config import Settings
+from app.metrics import metrics
+from app.tenancy import TENANT_ID_PATTERN, current_tenant, is_known_tenant, tenant_from_host
+
+
+class TenantMiddleware:
+    """
+    ASGI middleware that resolves the tenant of each request.
+
+    The tenant is taken from the tenant header, then the `tenant` query
+    parameter, then the subdomain, falling back to the default tenant. It is
+    set in a context variable for the rest of the request, which routes
+    repositories, caches, events and metrics to that tenant. Unknown tenants
+    are rejected before any handler runs.
+    """
+
+    def __init__(self, app, settings: Settings):
+        self.app = app
+        self.header = settings.tenant_header.lower().encode("latin-1")
+        self.base_domain = settings.tenant_base_domain
+        self.default_tenant = settings.default_tenant
+
+    def resolve(self, scope) -> str:
+        """Get the tenant a request names, or the default tenant."""
+        for name, value in scope["headers"]:
+            if name == self.header:
+                return value.decode("latin-1").strip().lower()
+
+        tenants = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("tenant")
+        if tenants:
+            return tenants[0].strip().lower()
+
+        host: Optional[str] = Headers(scope=scope).get("host")
+        if host:
+            tenant = tenant_from_host(host, self.base_domain)
+            if tenant:
+                return tenant
+        return self.default_tenant
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        tenant = self.resolve(scope)
+        if not TENANT_ID_PATTERN.match(tenant) or not is_known_tenant(tenant):
+            response = JSONResponse(
+                status_code=status.HTTP_404_NOT_FOUND,
+                content={"detail": f"Unknown tenant '{tenant[:64]}'"},
+            )
+            await response(scope, receive, send)
+            return
+
+        metrics.inc("tenant_requests_total", tenant=tenant)
+        token = current_tenant.set(tenant)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_tenant.reset(token)
@@ -2,20 +2,34 @@ from app.models.employee import (
     EmployeeCreate,
     EmployeeResponse,
     EmployeeInDB,
+    EmployeeBatchGetRequest,
+    EmployeeBatchGetResponse,
 )
 from app.models.attendance import (
     AttendanceCreate,
     AttendanceResponse,
     AttendanceStatus,
+    AttendanceCalendar,
 )
+from app.models.sync import SyncResponse
+from app.models.bootstrap import BootstrapPage, BootstrapResponse
+from app.models.profiling import ProfilingSettings, ProfileSummary
 
 __all__ = [
     "EmployeeCreate",
     "EmployeeResponse",
     "EmployeeInDB",
+    "EmployeeBatchGetRequest",
+    "EmployeeBatchGetResponse",
     "AttendanceCreate",
     "AttendanceResponse",
     "AttendanceStatus",
+    "AttendanceCalendar",
+    "SyncResponse",
+    "BootstrapPage",
+    "BootstrapResponse",
+    "ProfilingSettings",
+    "ProfileSummary",
 ]
 
 
@@ -0,0 +1,75 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import date as DateType
+
+
+class DepartmentAttendance(BaseModel):
+    """Model for attendance totals of one department over a date range."""
+    
+    department: str
+    employees: int
+    present_days: int
+    absent_days: int
+    attendance_rate: Optional[float] = Field(
+        None,
+        description="Present days as a percentage of marked days (null if nothing was marked)"
+    )
+
+
+class DepartmentAnalytics(BaseModel):
+    """Model for per-department attendance over a date range."""
+    
+    start_date: DateType
+    end_date: DateType
+    departments: List[DepartmentAttendance]
+
+
+class RollingAttendance(BaseModel):
+    """Model for a rolling attendance rate series."""
+    
+    start_date: DateType
+    end_date: DateType
+    window: int
+    department: Optional[str] = None
+    rates: List[Optional[float]] = Field(
+        ...,
+        description="One rate per day from start_date, over the trailing `window` days"
+    )
+
+
+class Absentee(BaseModel):
+    """Model for an employee flagged as chronically absent."""
+    
+    employee_id: str
+    department: str
+    absent_days: int
+    marked_days: int
+    absence_rate: Optional[float] = None
+    longest_absent_streak: int
+    current_absent_streak: int
+
+
+class AbsenteeAnalytics(BaseModel):
+    """Model for chronically absent employees over a date range."""
+    
+    start_date: DateType
+    end_date: DateType
+    absentees: List[Absentee]
+
+
+class WeekdayAttendance(BaseModel):
+    """Model for attendance totals of one day of the week."""
+    
+    weekday: str
+    present_days: int
+    absent_days: int
+    attendance_rate: Optional[float] = None
+
+
+class WeekdayAnalytics(BaseModel):
+    """Model for attendance per day of the week over a date range."""
+    
+    start_date: DateType
+    end_date: DateType
+    department: Optional[str] = None
+    weekdays: List[WeekdayAttendance]
@@ -66,3 +66,36 @@ class AttendanceSummary(BaseModel):
     total_absent: int
     total_days: int
 
+
+class AttendanceStreak(BaseModel):
+    """Model for a run of consecutive days with the same status."""
+    
+    status: Optional[AttendanceStatus] = None
+    days: int = 0
+
+
+class AttendanceCalendar(BaseModel):
+    """Model for an employee's attendance over a date range, one character per day."""
+    
+    employee_id: str
+    start_date: DateType
+    end_date: DateType
+    days: str = Field(
+        ...,
+        description="One character per day from start_date: P = Present, A = Absent, - = not marked"
+    )
+    total_present: int
+    total_absent: int
+    total_unmarked: int
+    current_streak: AttendanceStreak
+
+
+class CloseDayReport(BaseModel):
+    """Model for the result of an end-of-day close run."""
+    
+    date: DateType
+    unmarked: int = Field(..., description="Employees without a record when the run started")
+    inserted: int = Field(..., description="Absent records created")
+    skipped: int = Field(..., description="Employees marked by someone else during the run")
+    batches: int
+    duration_ms: float
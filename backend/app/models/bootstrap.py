@@ -0,0 +1,46 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from datetime import date as DateType
+from enum import Enum
+
+from app.models.attendance import AttendanceResponse, AttendanceStatus, AttendanceSummary
+
+
+class BootstrapPage(str, Enum):
+    """Pages with a bootstrap payload."""
+    
+    DASHBOARD = "dashboard"
+    ATTENDANCE = "attendance"
+
+
+class DashboardStats(BaseModel):
+    """Model for today's dashboard counters."""
+    
+    total_employees: int
+    present_today: int
+    absent_today: int
+    attendance_rate: float
+    date: DateType
+
+
+class BootstrapResponse(BaseModel):
+    """Model for everything a page needs on first load, in one response."""
+    
+    page: BootstrapPage
+    stats: DashboardStats
+    employees: Dict[str, str] = Field(
+        ...,
+        description="Employee ID to full name, newest employee first"
+    )
+    today: Dict[str, AttendanceStatus] = Field(
+        ...,
+        description="Today's status per employee ID; employees not marked yet are left out"
+    )
+    summary: Optional[List[AttendanceSummary]] = Field(
+        None,
+        description="Attendance summary per employee (dashboard page)"
+    )
+    attendance: Optional[List[AttendanceResponse]] = Field(
+        None,
+        description="Attendance records within the requested dates (attendance page)"
+    )
@@ -1,8 +1,12 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 
+# Upper bound on IDs per batch lookup
+BATCH_GET_MAX_IDS = 5000
+
+
 class EmployeeBase(BaseModel):
     """Base employee model with common fields."""
     
@@ -57,3 +61,25 @@ class EmployeeResponse(EmployeeBase):
         from_attributes = True
 
 
+class EmployeeBatchGetRequest(BaseModel):
+    """Model for looking up several employees at once."""
+    
+    employee_ids: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=BATCH_GET_MAX_IDS,
+        description=f"Employee IDs to look up (at most {BATCH_GET_MAX_IDS})"
+    )
+
+
+class EmployeeBatchGetResponse(BaseModel):
+    """Model for batch lookup results."""
+    
+    employees: Dict[str, EmployeeResponse] = Field(
+        ...,
+        description="Found employees keyed by employee ID"
+    )
+    missing: List[str] = Field(
+        ...,
+        description="Requested employee IDs that do not exist"
+    )
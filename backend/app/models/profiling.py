@@ -0,0 +1,45 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+
+class ProfilingSettings(BaseModel):
+    """Model for the request profiling toggle."""
+    
+    enabled: bool = Field(
+        ...,
+        description="Profile a random share of requests (X-Profile requests are always profiled)"
+    )
+    sample_rate: float = Field(
+        0.01,
+        gt=0,
+        le=1,
+        description="Share of matching requests to profile while enabled"
+    )
+    path_prefix: str = Field(
+        "/",
+        description="Only profile requests whose path starts with this"
+    )
+
+
+class ProfileBreakdown(BaseModel):
+    """Model for sampled time per category, in milliseconds."""
+    
+    cpu: float = Field(..., description="Running Python code (handlers, validation, serialization)")
+    await_mongo: float = Field(..., description="Suspended waiting on MongoDB")
+    await_other: float = Field(..., description="Suspended waiting on anything else")
+    runnable: float = Field(..., description="Ready to resume but waiting for the event loop")
+
+
+class ProfileSummary(BaseModel):
+    """Model for one profiled request."""
+    
+    id: int
+    method: str
+    path: str
+    tenant: str
+    status_code: Optional[int] = None
+    started_at: datetime
+    duration_ms: Optional[float] = None
+    samples: int
+    breakdown_ms: ProfileBreakdown
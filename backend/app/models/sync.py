@@ -0,0 +1,30 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+from app.models.employee import EmployeeResponse
+from app.models.attendance import AttendanceResponse
+
+
+class SyncResponse(BaseModel):
+    """Model for a delta sync response."""
+    
+    token: str = Field(
+        ...,
+        description="Pass as `since` on the next sync"
+    )
+    full: bool = Field(
+        ...,
+        description="True if this is a full snapshot that replaces all local data"
+    )
+    employees: List[EmployeeResponse] = Field(
+        ...,
+        description="Employees created or updated since the token"
+    )
+    attendance: List[AttendanceResponse] = Field(
+        ...,
+        description="Attendance records created or updated since the token"
+    )
+    deleted_employees: List[str] = Field(
+        ...,
+        description="Employee IDs deleted since the token, along with all their attendance"
+    )
@@ -0,0 +1,285 @@
+import asyncio
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+from types import FrameType
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# Sample categories
+CPU = "cpu"
+AWAIT_MONGO = "await_mongo"
+AWAIT_OTHER = "await_other"
+RUNNABLE = "runnable"
+CATEGORIES = (CPU, AWAIT_MONGO, AWAIT_OTHER, RUNNABLE)
+
+# A suspended request whose await chain passes through these is waiting on MongoDB
+MONGO_PATH_MARKERS = (
+    f"{os.sep}motor{os.sep}",
+    f"{os.sep}pymongo{os.sep}",
+    f"{os.sep}repositories{os.sep}mongo.py",
+)
+
+BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SITE_PACKAGES = f"{os.sep}site-packages{os.sep}"
+
+# The profile of the request being handled, inherited by tasks it creates
+current_profile: ContextVar[Optional["Profile"]] = ContextVar("current_profile", default=None)
+
+
+class ProfilingToggle:
+    """Runtime switch for profiling a random share of requests, set from the admin API."""
+
+    enabled: bool = False
+    # Same default as ProfilingSettings, so the admin API reports the real state
+    sample_rate: float = 0.01
+    path_prefix: str = "/"
+
+
+def frame_label(frame: FrameType) -> str:
+    """Name a frame as `function (file:first line)`, safe for collapsed stacks."""
+    code = frame.f_code
+    filename = code.co_filename
+    if SITE_PACKAGES in filename:
+        filename = filename.split(SITE_PACKAGES, 1)[1]
+    elif filename.startswith(BACKEND_ROOT):
+        filename = os.path.relpath(filename, BACKEND_ROOT)
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({filename}:{code.co_firstlineno})".replace(";", ",")
+
+
+def thread_stack(frame: Optional[FrameType]) -> List[FrameType]:
+    """Frames of a running thread, outermost first."""
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+    return frames
+
+
+def await_stack(task: asyncio.Task) -> Tuple[List[FrameType], Optional[asyncio.Future]]:
+    """
+    Frames of a suspended task along its await chain, outermost first, and
+    the future it is blocked on (None when it is ready to resume).
+
+    Follows awaited tasks, and into the first pending child of a gather().
+    """
+    frames = []
+    while True:
+        awaitable = task.get_coro()
+        while awaitable is not None:
+            frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+            if frame is None:
+                break
+            frames.append(frame)
+            awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None)
+
+        waiter = task._fut_waiter
+        children = getattr(waiter, "_children", None) or ()
+        waiter = next((child for child in children if not child.done()), waiter)
+        if not isinstance(waiter, asyncio.Task):
+            return frames, waiter
+        task = waiter
+
+
+class Profile:
+    """Stack samples of one request, with time per category."""
+
+    ids = itertools.count(1)
+
+    def __init__(
+        self,
+        method: str,
+        path: str,
+        tenant: str,
+        root_task: asyncio.Task,
+        root_frame: FrameType,
+    ):
+        self.id = next(Profile.ids)
+        self.method = method
+        self.path = path
+        self.tenant = tenant
+        self.status_code: Optional[int] = None
+        self.started_at = datetime.utcnow()
+        self.started = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.root_task = root_task
+        self.root_frame = root_frame
+        # Tasks working for this request: the request's own and those it spawned
+        self.tasks: Set[asyncio.Task] = {root_task}
+        self.samples = 0
+        # Microseconds per stack and per category. Samples are weighted by the time
+        # since the previous one: code holding the GIL delays the sampler thread,
+        # and counting samples alone would under-report CPU time.
+        self.stacks: Counter = Counter()
+        self.categories: Counter = Counter()
+
+    def sample(self, loop_frame: Optional[FrameType], elapsed_us: int):
+        """Record where the request is right now. Called from the sampler thread."""
+        for task in tuple(self.tasks):
+            coro = task.get_coro()
+            if getattr(coro, "cr_running", False):
+                category = CPU
+                frames = thread_stack(loop_frame)
+                # Keep frames below this middleware, or a spawned task's own frames
+                if task is self.root_task and self.root_frame in frames:
+                    frames = frames[frames.index(self.root_frame) + 1:]
+                elif coro.cr_frame in frames:
+                    frames = frames[frames.index(coro.cr_frame):]
+                break
+        else:
+            if self.root_task.done():
+                return
+            frames, leaf = await_stack(self.root_task)
+            if self.root_frame in frames:
+                frames = frames[frames.index(self.root_frame) + 1:]
+            if leaf is None or leaf.done():
+                category = RUNNABLE
+            elif any(marker in frame.f_code.co_filename for frame in frames for marker in MONGO_PATH_MARKERS):
+                category = AWAIT_MONGO
+            else:
+                category = AWAIT_OTHER
+
+        self.samples += 1
+        self.categories[category] += elapsed_us
+        labels = [f"{self.method} {self.path}", f"[{category}]"] + [frame_label(frame) for frame in frames]
+        self.stacks[";".join(labels)] += elapsed_us
+
+    def finish(self):
+        """Stop the clock and release the request's tasks and frames."""
+        self.duration_ms = round((time.perf_counter() - self.started) * 1000, 1)
+        self.tasks = set()
+        self.root_task = None
+        self.root_frame = None
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "tenant": self.tenant,
+            "status_code": self.status_code,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "samples": self.samples,
+            "breakdown_ms": {
+                category: round(self.categories[category] / 1000, 1)
+                for category in CATEGORIES
+            },
+        }
+
+    def collapsed(self) -> str:
+        """Stacks in collapsed-stack format (weights in microseconds), for flamegraph.pl, speedscope and similar."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class Sampler:
+    """
+    Background thread sampling the event loop thread while requests are profiled.
+
+    The thread only exists while at least one profile is active, so profiling
+    costs nothing between profiled requests.
+    """
+
+    def __init__(self, interval_ms: float):
+        self.interval_ms = interval_ms
+        self.active: Set[Profile] = set()
+        self.lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+        self.loop_thread_id: Optional[int] = None
+
+    def start(self, profile: Profile):
+        """Start sampling a profile. Call from the event loop thread."""
+        with self.lock:
+            self.active.add(profile)
+            self.loop_thread_id = threading.get_ident()
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="request-profiler", daemon=True)
+                self.thread.start()
+
+    def stop(self, profile: Profile):
+        with self.lock:
+            self.active.discard(profile)
+
+    def is_active(self) -> bool:
+        return bool(self.active)
+
+    def run(self):
+        previous = time.perf_counter()
+        while True:
+            time.sleep(self.interval_ms / 1000)
+            with self.lock:
+                if not self.active:
+                    self.thread = None
+                    return
+                now = time.perf_counter()
+                loop_frame = sys._current_frames().get(self.loop_thread_id)
+                for profile in list(self.active):
+                    elapsed_us = int((now - max(previous, profile.started)) * 1_000_000)
+                    try:
+                        profile.sample(loop_frame, elapsed_us)
+                    except Exception:
+                        # The loop moved on while we were reading its state; skip this sample
+                        pass
+                previous = now
+
+
+class ProfileStore:
+    """The most recent finished profiles."""
+
+    def __init__(self, max_profiles: int):
+        self.profiles: Deque[Profile] = deque(maxlen=max_profiles)
+
+    def add(self, profile: Profile):
+        self.profiles.append(profile)
+
+    def get(self, profile_id: int) -> Optional[Profile]:
+        return next((profile for profile in self.profiles if profile.id == profile_id), None)
+
+    def list(self) -> List[Profile]:
+        """Profiles, newest first."""
+        return list(reversed(self.profiles))
+
+    def clear(self):
+        self.profiles.clear()
+
+
+sampler = Sampler(settings.profiling_interval_ms)
+profile_store = ProfileStore(settings.profiling_max_profiles)
+
+
+# Task factories the loops had before profiling_task_factory was installed
+previous_task_factories: Dict[asyncio.AbstractEventLoop, Optional[Callable]] = {}
+
+
+def profiling_task_factory(loop, coro, **kwargs):
+    """Task factory that attributes tasks spawned by a profiled request to its profile."""
+    previous = previous_task_factories.get(loop)
+    task = previous(loop, coro, **kwargs) if previous else asyncio.Task(coro, loop=loop, **kwargs)
+    profile = current_profile.get()
+    if profile is not None:
+        profile.tasks.add(task)
+    return task
+
+
+def install_task_factory(loop: asyncio.AbstractEventLoop):
+    """Track spawned tasks while any request is profiled."""
+    factory = loop.get_task_factory()
+    if factory is not profiling_task_factory:
+        previous_task_factories[loop] = factory
+        loop.set_task_factory(profiling_task_factory)
+
+
+def uninstall_task_factory(loop: asyncio.AbstractEventLoop):
+    """Restore the loop's own task factory once nothing is profiled."""
+    if loop.get_task_factory() is profiling_task_factory:
+        loop.set_task_factory(previous_task_factories.pop(loop, None))
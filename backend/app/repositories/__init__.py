@@ -0,0 +1,137 @@
+from functools import partial
+from typing import Dict
+
+from app.config import get_settings
+from app.database import (
+    Database,
+    EMPLOYEES_COLLECTION,
+    ATTENDANCE_COLLECTION,
+    ATTENDANCE_ARCHIVE_COLLECTION,
+    TOMBSTONES_COLLECTION,
+)
+from app.repositories.base import EmployeeRepository, AttendanceRepository, TombstoneRepository
+from app.repositories.memory import (
+    MemoryStore,
+    MemoryEmployeeRepository,
+    MemoryAttendanceRepository,
+    MemoryTombstoneRepository,
+)
+from app.repositories.mongo import MongoEmployeeRepository, MongoAttendanceRepository, MongoTombstoneRepository
+from app.repositories.tiered import TieredAttendanceRepository
+from app.tenancy import get_current_tenant, get_tenant_ids, validate_tenant_ids
+
+settings = get_settings()
+
+
+class TenantRepositories:
+    """Repository instances of one tenant."""
+
+    def __init__(
+        self,
+        employees: EmployeeRepository,
+        attendance: TieredAttendanceRepository,
+        tombstones: TombstoneRepository,
+    ):
+        self.employees = employees
+        self.attendance = attendance
+        self.tombstones = tombstones
+
+
+class Repositories:
+    """Repository instances for the configured storage backend, per tenant."""
+
+    tenants: Dict[str, TenantRepositories] = {}
+
+    @classmethod
+    def configure(cls, backend: str):
+        """Create the repositories of every tenant for a storage backend."""
+        if backend not in ("memory", "mongo"):
+            raise ValueError(f"Unknown storage backend '{backend}'")
+        validate_tenant_ids()
+        cls.tenants = {tenant: cls.create(backend, tenant) for tenant in get_tenant_ids()}
+
+    @staticmethod
+    def create(backend: str, tenant: str) -> TenantRepositories:
+        """Create one tenant's repositories."""
+        tombstone_retention = settings.sync_tombstone_retention_days * 24 * 3600
+        if backend == "memory":
+            store = MemoryStore()
+            return TenantRepositories(
+                MemoryEmployeeRepository(store),
+                TieredAttendanceRepository(
+                    MemoryAttendanceRepository(store),
+                    MemoryAttendanceRepository(MemoryStore()),
+                ),
+                MemoryTombstoneRepository(tombstone_retention),
+            )
+
+        # Collections are bound to the tenant, so background jobs and
+        # requests can never reach another tenant's database
+        employees = partial(Database.get_collection, EMPLOYEES_COLLECTION, tenant)
+        return TenantRepositories(
+            MongoEmployeeRepository(employees),
+            TieredAttendanceRepository(
+                MongoAttendanceRepository(partial(Database.get_collection, ATTENDANCE_COLLECTION, tenant), employees),
+                MongoAttendanceRepository(partial(Database.get_collection, ATTENDANCE_ARCHIVE_COLLECTION, tenant), employees),
+            ),
+            MongoTombstoneRepository(
+                tombstone_retention,
+                partial(Database.get_collection, TOMBSTONES_COLLECTION, tenant),
+            ),
+        )
+
+    @classmethod
+    def current(cls) -> TenantRepositories:
+        """Get the current tenant's repositories."""
+        return cls.tenants[get_current_tenant()]
+
+
+Repositories.configure(settings.storage_backend)
+
+
+async def connect_storage():
+    """Connect the storage backend and make sure every tenant's indexes exist."""
+    if settings.storage_backend != "mongo":
+        print(f"Using {settings.storage_backend} storage backend")
+        return
+    await Database.connect()
+    for repositories in Repositories.tenants.values():
+        await repositories.employees.ensure_indexes()
+        await repositories.attendance.hot.ensure_indexes()
+        await repositories.attendance.archive.ensure_indexes()
+        await repositories.tombstones.ensure_indexes()
+        await repositories.attendance.load_watermark()
+
+
+async def disconnect_storage():
+    """Disconnect the storage backend."""
+    if settings.storage_backend == "mongo":
+        await Database.disconnect()
+
+
+def get_employee_repository() -> EmployeeRepository:
+    """Get the current tenant's employee repository."""
+    return Repositories.current().employees
+
+
+def get_attendance_repository() -> TieredAttendanceRepository:
+    """Get the current tenant's attendance repository (hot and archive tiers)."""
+    return Repositories.current().attendance
+
+
+def get_tombstone_repository() -> TombstoneRepository:
+    """Get the current tenant's repository of deletion markers."""
+    return Repositories.current().tombstones
+
+
+__all__ = [
+    "EmployeeRepository",
+    "AttendanceRepository",
+    "TieredAttendanceRepository",
+    "TombstoneRepository",
+    "connect_storage",
+    "disconnect_storage",
+    "get_employee_repository",
+    "get_attendance_repository",
+    "get_tombstone_repository",
+]
@@ -0,0 +1,135 @@
+from abc import ABC, abstractmethod
+from datetime import date, datetime, time, timedelta
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+
+def end_of_day(day: date) -> datetime:
+    """First instant after `day`, comparable with the naive UTC `created_at` timestamps."""
+    return datetime.combine(day + timedelta(days=1), time.min)
+
+
+class EmployeeRepository(ABC):
+    """Storage interface for employee documents."""
+
+    @abstractmethod
+    async def get(self, employee_id: str) -> Optional[dict]:
+        """Get an employee by employee_id."""
+
+    @abstractmethod
+    async def get_many(self, employee_ids: Iterable[str]) -> Dict[str, dict]:
+        """Get several employees in one round trip, keyed by employee_id."""
+
+    @abstractmethod
+    async def get_by_email(self, email: str) -> Optional[dict]:
+        """Get an employee by email address."""
+
+    @abstractmethod
+    async def list_all(self) -> List[dict]:
+        """Get all employees, newest first."""
+
+    @abstractmethod
+    async def name_map(self) -> Dict[str, str]:
+        """Get a mapping of employee_id to full name."""
+
+    @abstractmethod
+    async def departments(self) -> Dict[str, str]:
+        """Get a mapping of employee_id to department."""
+
+    @abstractmethod
+    async def count(self) -> int:
+        """Count all employees."""
+
+    @abstractmethod
+    async def changed_since(self, since: datetime) -> List[dict]:
+        """Get employees created or updated after `since`."""
+
+    @abstractmethod
+    async def create(self, document: dict) -> dict:
+        """Insert an employee and return it with its `_id` set."""
+
+    @abstractmethod
+    async def delete(self, employee_id: str) -> bool:
+        """Delete an employee. Returns False if it did not exist."""
+
+
+class AttendanceRepository(ABC):
+    """Storage interface for attendance documents."""
+
+    @abstractmethod
+    async def get(self, employee_id: str, day: date) -> Optional[dict]:
+        """Get the attendance record of an employee for a day."""
+
+    @abstractmethod
+    async def find(
+        self,
+        employee_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> List[dict]:
+        """Get attendance records matching the filters, newest date first."""
+
+    @abstractmethod
+    def status_batches(self, start_date: date, end_date: date) -> AsyncIterator[List[Tuple[str, str, str]]]:
+        """Stream (employee_id, ISO date, status) of every record in a range, in batches of any order."""
+
+    @abstractmethod
+    async def status_by_date(self, employee_id: str, start_date: date, end_date: date) -> Dict[str, str]:
+        """Get an employee's status per ISO date within a range (dates and statuses only)."""
+
+    @abstractmethod
+    async def changed_since(self, since: datetime) -> List[dict]:
+        """Get records created or updated after `since`."""
+
+    @abstractmethod
+    async def upsert(self, employee_id: str, day: date, status: str, now: datetime) -> dict:
+        """Create or update the record of an employee for a day and return it."""
+
+    @abstractmethod
+    async def insert_many(self, documents: List[dict]) -> int:
+        """Insert records in one batch. Returns the number inserted."""
+
+    @abstractmethod
+    async def count_by_status(self, day: date) -> Dict[str, int]:
+        """Count the records of a day per status."""
+
+    @abstractmethod
+    async def unmarked_employee_ids(self, day: date) -> List[str]:
+        """Get the IDs of employees who existed on a day but have no record for it."""
+
+    @abstractmethod
+    async def summary_counts(self) -> Dict[str, Dict[str, int]]:
+        """Count all records per employee_id and status."""
+
+    @abstractmethod
+    async def delete_for_employee(self, employee_id: str) -> int:
+        """Delete all records of an employee. Returns the number deleted."""
+
+    # Archival primitives, used to move old records between storage tiers
+
+    @abstractmethod
+    async def find_before(self, cutoff: date, limit: int) -> List[dict]:
+        """Get up to `limit` records dated before `cutoff`, oldest first."""
+
+    @abstractmethod
+    async def replace_many(self, documents: List[dict]) -> int:
+        """Insert records, replacing any existing record for the same employee and day."""
+
+    @abstractmethod
+    async def delete_unchanged(self, documents: List[dict]) -> int:
+        """Delete records by `_id` unless they were updated since they were read."""
+
+    @abstractmethod
+    async def latest_date(self) -> Optional[date]:
+        """Get the most recent date that has a record."""
+
+
+class TombstoneRepository(ABC):
+    """Storage interface for deletion markers, so sync clients learn about deletes."""
+
+    @abstractmethod
+    async def record(self, kind: str, key: str, deleted_at: datetime):
+        """Record that the `kind` entity identified by `key` was deleted."""
+
+    @abstractmethod
+    async def deleted_since(self, kind: str, since: datetime) -> List[str]:
+        """Get the keys of `kind` entities deleted after `since`."""
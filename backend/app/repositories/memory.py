@@ -0,0 +1,272 @@
+import bisect
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+from bson import ObjectId
+
+from app.repositories.base import EmployeeRepository, AttendanceRepository, TombstoneRepository, end_of_day
+
+
+class MemoryStore:
+    """
+    In-process storage with the same indexes the Mongo backend relies on.
+
+    Used for tests and benchmarks, so no lookup degrades into a full scan.
+    """
+
+    def __init__(self):
+        # employees: employee_id -> document, plus a unique email index
+        self.employees: Dict[str, dict] = {}
+        self.employee_emails: Dict[str, str] = {}
+
+        # attendance: _id -> document, plus (employee_id, date), employee and date indexes
+        self.attendance: Dict[ObjectId, dict] = {}
+        self.attendance_keys: Dict[Tuple[str, str], ObjectId] = {}
+        self.attendance_by_employee: Dict[str, Set[ObjectId]] = {}
+        self.attendance_by_date: Dict[str, Set[ObjectId]] = {}
+        self.attendance_dates: List[str] = []
+
+    def add_attendance(self, document: dict) -> bool:
+        """Index a new attendance record. Returns False on a duplicate day."""
+        key = (document["employee_id"], document["date"])
+        if key in self.attendance_keys:
+            return False
+        record_id = document.setdefault("_id", ObjectId())
+        self.attendance[record_id] = document
+        self.attendance_keys[key] = record_id
+        self.attendance_by_employee.setdefault(document["employee_id"], set()).add(record_id)
+        if document["date"] not in self.attendance_by_date:
+            bisect.insort(self.attendance_dates, document["date"])
+            self.attendance_by_date[document["date"]] = set()
+        self.attendance_by_date[document["date"]].add(record_id)
+        return True
+
+    def remove_attendance(self, record_id: ObjectId):
+        """Drop an attendance record from the store and all indexes."""
+        document = self.attendance.pop(record_id)
+        del self.attendance_keys[(document["employee_id"], document["date"])]
+        self.attendance_by_employee[document["employee_id"]].discard(record_id)
+        same_day = self.attendance_by_date[document["date"]]
+        same_day.discard(record_id)
+        if not same_day:
+            del self.attendance_by_date[document["date"]]
+            index = bisect.bisect_left(self.attendance_dates, document["date"])
+            del self.attendance_dates[index]
+
+    def dates_between(self, start: Optional[str], end: Optional[str]) -> List[str]:
+        """Get the stored dates within an inclusive ISO range."""
+        low = bisect.bisect_left(self.attendance_dates, start) if start else 0
+        high = bisect.bisect_right(self.attendance_dates, end) if end else len(self.attendance_dates)
+        return self.attendance_dates[low:high]
+
+
+class MemoryEmployeeRepository(EmployeeRepository):
+    """Employee repository backed by a MemoryStore."""
+
+    def __init__(self, store: MemoryStore):
+        self.store = store
+
+    async def get(self, employee_id: str) -> Optional[dict]:
+        employee = self.store.employees.get(employee_id)
+        return dict(employee) if employee else None
+
+    async def get_many(self, employee_ids: Iterable[str]) -> Dict[str, dict]:
+        employees = self.store.employees
+        return {
+            employee_id: dict(employees[employee_id])
+            for employee_id in employee_ids
+            if employee_id in employees
+        }
+
+    async def get_by_email(self, email: str) -> Optional[dict]:
+        employee_id = self.store.employee_emails.get(email)
+        return await self.get(employee_id) if employee_id else None
+
+    async def list_all(self) -> List[dict]:
+        employees = sorted(self.store.employees.values(), key=lambda e: e["created_at"], reverse=True)
+        return [dict(employee) for employee in employees]
+
+    async def name_map(self) -> Dict[str, str]:
+        return {
+            employee_id: employee["full_name"]
+            for employee_id, employee in self.store.employees.items()
+        }
+
+    async def departments(self) -> Dict[str, str]:
+        return {
+            employee_id: employee["department"]
+            for employee_id, employee in self.store.employees.items()
+        }
+
+    async def count(self) -> int:
+        return len(self.store.employees)
+
+    async def changed_since(self, since: datetime) -> List[dict]:
+        return [dict(employee) for employee in self.store.employees.values() if employee["updated_at"] > since]
+
+    async def create(self, document: dict) -> dict:
+        document["_id"] = ObjectId()
+        self.store.employees[document["employee_id"]] = dict(document)
+        self.store.employee_emails[document["email"]] = document["employee_id"]
+        return document
+
+    async def delete(self, employee_id: str) -> bool:
+        employee = self.store.employees.pop(employee_id, None)
+        if employee is None:
+            return False
+        self.store.employee_emails.pop(employee["email"], None)
+        return True
+
+
+class MemoryAttendanceRepository(AttendanceRepository):
+    """Attendance repository backed by a MemoryStore."""
+
+    def __init__(self, store: MemoryStore):
+        self.store = store
+
+    async def get(self, employee_id: str, day: date) -> Optional[dict]:
+        record_id = self.store.attendance_keys.get((employee_id, day.isoformat()))
+        return dict(self.store.attendance[record_id]) if record_id else None
+
+    async def find(
+        self,
+        employee_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> List[dict]:
+        start = start_date.isoformat() if start_date else None
+        end = end_date.isoformat() if end_date else None
+        store = self.store
+
+        if employee_id is not None:
+            records = [store.attendance[record_id] for record_id in store.attendance_by_employee.get(employee_id, ())]
+            records = [
+                record for record in records
+                if (start is None or record["date"] >= start) and (end is None or record["date"] <= end)
+            ]
+            records.sort(key=lambda record: record["date"], reverse=True)
+            return [dict(record) for record in records]
+
+        records = []
+        for day in reversed(store.dates_between(start, end)):
+            records.extend(dict(store.attendance[record_id]) for record_id in store.attendance_by_date[day])
+        return records
+
+    async def status_batches(self, start_date: date, end_date: date) -> AsyncIterator[List[Tuple[str, str, str]]]:
+        store = self.store
+        for day in store.dates_between(start_date.isoformat(), end_date.isoformat()):
+            records = [store.attendance[record_id] for record_id in store.attendance_by_date[day]]
+            yield [(record["employee_id"], day, record["status"]) for record in records]
+
+    async def status_by_date(self, employee_id: str, start_date: date, end_date: date) -> Dict[str, str]:
+        start, end = start_date.isoformat(), end_date.isoformat()
+        statuses = {}
+        for record_id in self.store.attendance_by_employee.get(employee_id, ()):
+            record = self.store.attendance[record_id]
+            if start <= record["date"] <= end:
+                statuses[record["date"]] = record["status"]
+        return statuses
+
+    async def changed_since(self, since: datetime) -> List[dict]:
+        return [dict(record) for record in self.store.attendance.values() if record["updated_at"] > since]
+
+    async def upsert(self, employee_id: str, day: date, status: str, now: datetime) -> dict:
+        record_id = self.store.attendance_keys.get((employee_id, day.isoformat()))
+        if record_id:
+            record = self.store.attendance[record_id]
+            record["status"] = status
+            record["updated_at"] = now
+            return dict(record)
+
+        record = {
+            "employee_id": employee_id,
+            "date": day.isoformat(),
+            "status": status,
+            "created_at": now,
+            "updated_at": now,
+        }
+        self.store.add_attendance(record)
+        return dict(record)
+
+    async def insert_many(self, documents: List[dict]) -> int:
+        inserted = 0
+        for document in documents:
+            if self.store.add_attendance(dict(document)):
+                inserted += 1
+        return inserted
+
+    async def count_by_status(self, day: date) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for record_id in self.store.attendance_by_date.get(day.isoformat(), ()):
+            status = self.store.attendance[record_id]["status"]
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+
+    async def unmarked_employee_ids(self, day: date) -> List[str]:
+        day_key = day.isoformat()
+        hired_before = end_of_day(day)
+        return [
+            employee_id for employee_id, employee in self.store.employees.items()
+            if employee["created_at"] < hired_before and (employee_id, day_key) not in self.store.attendance_keys
+        ]
+
+    async def summary_counts(self) -> Dict[str, Dict[str, int]]:
+        counts: Dict[str, Dict[str, int]] = {}
+        for record in self.store.attendance.values():
+            by_status = counts.setdefault(record["employee_id"], {})
+            by_status[record["status"]] = by_status.get(record["status"], 0) + 1
+        return counts
+
+    async def delete_for_employee(self, employee_id: str) -> int:
+        record_ids = list(self.store.attendance_by_employee.get(employee_id, ()))
+        for record_id in record_ids:
+            self.store.remove_attendance(record_id)
+        self.store.attendance_by_employee.pop(employee_id, None)
+        return len(record_ids)
+
+    async def find_before(self, cutoff: date, limit: int) -> List[dict]:
+        records = []
+        for day in self.store.dates_between(None, (cutoff - timedelta(days=1)).isoformat()):
+            records.extend(dict(self.store.attendance[record_id]) for record_id in self.store.attendance_by_date[day])
+            if len(records) >= limit:
+                break
+        return records[:limit]
+
+    async def replace_many(self, documents: List[dict]) -> int:
+        for document in documents:
+            record_id = self.store.attendance_keys.get((document["employee_id"], document["date"]))
+            if record_id:
+                self.store.remove_attendance(record_id)
+            self.store.add_attendance(dict(document))
+        return len(documents)
+
+    async def delete_unchanged(self, documents: List[dict]) -> int:
+        deleted = 0
+        for document in documents:
+            record = self.store.attendance.get(document["_id"])
+            if record and record["updated_at"] == document["updated_at"]:
+                self.store.remove_attendance(document["_id"])
+                deleted += 1
+        return deleted
+
+    async def latest_date(self) -> Optional[date]:
+        dates = self.store.attendance_dates
+        return date.fromisoformat(dates[-1]) if dates else None
+
+
+class MemoryTombstoneRepository(TombstoneRepository):
+    """Tombstone repository keeping markers in deletion order."""
+
+    def __init__(self, retention_seconds: int):
+        self.retention = timedelta(seconds=retention_seconds)
+        self.tombstones: List[Tuple[datetime, str, str]] = []
+
+    async def record(self, kind: str, key: str, deleted_at: datetime):
+        bisect.insort(self.tombstones, (deleted_at, kind, key))
+        # Expire old markers like the Mongo TTL index does
+        expired = bisect.bisect_left(self.tombstones, (deleted_at - self.retention,))
+        del self.tombstones[:expired]
+
+    async def deleted_since(self, kind: str, since: datetime) -> List[str]:
+        start = bisect.bisect_right(self.tombstones, (since, chr(0x10FFFF)))
+        return [key for _, tombstone_kind, key in self.tombstones[start:] if tombstone_kind == kind]
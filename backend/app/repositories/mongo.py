@@ -0,0 +1,270 @@
+from datetime import date, datetime
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING, DeleteOne, ReplaceOne, ReturnDocument
+from pymongo.errors import BulkWriteError, OperationFailure
+
+from app.database import get_employees_collection, get_attendance_collection, get_tombstones_collection
+from app.repositories.base import EmployeeRepository, AttendanceRepository, TombstoneRepository, end_of_day
+
+DUPLICATE_KEY_ERROR = 11000
+
+# Documents per round trip when streaming attendance for analytics
+STATUS_BATCH_SIZE = 10000
+
+
+def date_range_query(start_date: Optional[date], end_date: Optional[date]) -> dict:
+    """Build a filter on the ISO `date` field."""
+    date_query = {}
+    if start_date:
+        date_query["$gte"] = start_date.isoformat()
+    if end_date:
+        date_query["$lte"] = end_date.isoformat()
+    return {"date": date_query} if date_query else {}
+
+
+async def create_indexes(collection, indexes: List[tuple]):
+    """Create indexes, logging instead of failing startup on conflicts."""
+    for keys, options in indexes:
+        try:
+            await collection.create_index(keys, **options)
+        except OperationFailure as e:
+            print(f"Could not create index {keys} on {collection.name}: {e}")
+
+
+class MongoEmployeeRepository(EmployeeRepository):
+    """Employee repository backed by MongoDB through Motor."""
+
+    def __init__(self, get_collection=get_employees_collection):
+        self.get_collection = get_collection
+
+    async def ensure_indexes(self):
+        await create_indexes(self.get_collection(), [
+            ([("employee_id", ASCENDING)], {"unique": True}),
+            ([("email", ASCENDING)], {"unique": True}),
+            ([("created_at", DESCENDING)], {}),
+            ([("updated_at", ASCENDING)], {}),
+        ])
+
+    async def get(self, employee_id: str) -> Optional[dict]:
+        return await self.get_collection().find_one({"employee_id": employee_id})
+
+    async def get_many(self, employee_ids: Iterable[str]) -> Dict[str, dict]:
+        employees = {}
+        async for employee in self.get_collection().find({"employee_id": {"$in": list(employee_ids)}}):
+            employees[employee["employee_id"]] = employee
+        return employees
+
+    async def get_by_email(self, email: str) -> Optional[dict]:
+        return await self.get_collection().find_one({"email": email})
+
+    async def list_all(self) -> List[dict]:
+        return await self.get_collection().find().sort("created_at", -1).to_list(None)
+
+    async def name_map(self) -> Dict[str, str]:
+        names = {}
+        cursor = self.get_collection().find({}, {"_id": 0, "employee_id": 1, "full_name": 1})
+        async for employee in cursor:
+            names[employee["employee_id"]] = employee["full_name"]
+        return names
+
+    async def departments(self) -> Dict[str, str]:
+        departments = {}
+        cursor = self.get_collection().find({}, {"_id": 0, "employee_id": 1, "department": 1})
+        async for employee in cursor:
+            departments[employee["employee_id"]] = employee["department"]
+        return departments
+
+    async def count(self) -> int:
+        return await self.get_collection().count_documents({})
+
+    async def changed_since(self, since: datetime) -> List[dict]:
+        return await self.get_collection().find({"updated_at": {"$gt": since}}).to_list(None)
+
+    async def create(self, document: dict) -> dict:
+        result = await self.get_collection().insert_one(document)
+        document["_id"] = result.inserted_id
+        return document
+
+    async def delete(self, employee_id: str) -> bool:
+        result = await self.get_collection().delete_one({"employee_id": employee_id})
+        return result.deleted_count > 0
+
+
+class MongoAttendanceRepository(AttendanceRepository):
+    """Attendance repository backed by MongoDB through Motor."""
+
+    def __init__(self, get_collection=get_attendance_collection, get_employees=get_employees_collection):
+        self.get_collection = get_collection
+        self.get_employees = get_employees
+
+    async def ensure_indexes(self):
+        await create_indexes(self.get_collection(), [
+            ([("employee_id", ASCENDING), ("date", DESCENDING)], {"unique": True}),
+            # Covers the day counts and the analytics scan without fetching documents
+            ([("date", DESCENDING), ("status", ASCENDING), ("employee_id", ASCENDING)], {}),
+            ([("updated_at", ASCENDING)], {}),
+        ])
+
+    async def get(self, employee_id: str, day: date) -> Optional[dict]:
+        return await self.get_collection().find_one({
+            "employee_id": employee_id,
+            "date": day.isoformat(),
+        })
+
+    async def find(
+        self,
+        employee_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> List[dict]:
+        query = date_range_query(start_date, end_date)
+        if employee_id is not None:
+            query["employee_id"] = employee_id
+        return await self.get_collection().find(query).sort("date", -1).to_list(None)
+
+    async def status_batches(self, start_date: date, end_date: date) -> AsyncIterator[List[Tuple[str, str, str]]]:
+        cursor = self.get_collection().find(
+            date_range_query(start_date, end_date),
+            {"_id": 0, "employee_id": 1, "date": 1, "status": 1},
+            batch_size=STATUS_BATCH_SIZE,
+        )
+        while True:
+            records = await cursor.to_list(length=STATUS_BATCH_SIZE)
+            if not records:
+                break
+            yield [(record["employee_id"], record["date"], record["status"]) for record in records]
+
+    async def status_by_date(self, employee_id: str, start_date: date, end_date: date) -> Dict[str, str]:
+        query = {"employee_id": employee_id, **date_range_query(start_date, end_date)}
+        cursor = self.get_collection().find(query, {"_id": 0, "date": 1, "status": 1})
+        return {record["date"]: record["status"] async for record in cursor}
+
+    async def changed_since(self, since: datetime) -> List[dict]:
+        return await self.get_collection().find({"updated_at": {"$gt": since}}).to_list(None)
+
+    async def upsert(self, employee_id: str, day: date, status: str, now: datetime) -> dict:
+        # Single round trip; the unique (employee_id, date) index keeps it one record per day
+        return await self.get_collection().find_one_and_update(
+            {"employee_id": employee_id, "date": day.isoformat()},
+            {
+                "$set": {"status": status, "updated_at": now},
+                "$setOnInsert": {"created_at": now},
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def insert_many(self, documents: List[dict]) -> int:
+        if not documents:
+            return 0
+        try:
+            result = await self.get_collection().insert_many(documents, ordered=False)
+            return len(result.inserted_ids)
+        except BulkWriteError as e:
+            # Duplicates of existing (employee_id, date) records are skipped
+            if any(error["code"] != DUPLICATE_KEY_ERROR for error in e.details["writeErrors"]):
+                raise
+            return e.details["nInserted"]
+
+    async def count_by_status(self, day: date) -> Dict[str, int]:
+        pipeline = [
+            {"$match": {"date": day.isoformat()}},
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+        ]
+        counts = {}
+        async for row in self.get_collection().aggregate(pipeline):
+            counts[row["_id"]] = row["count"]
+        return counts
+
+    async def unmarked_employee_ids(self, day: date) -> List[str]:
+        # Anti-join: each employee hired by then probes the (employee_id, date) index for the day
+        pipeline = [
+            {"$match": {"created_at": {"$lt": end_of_day(day)}}},
+            {"$lookup": {
+                "from": self.get_collection().name,
+                "let": {"employee_id": "$employee_id"},
+                "pipeline": [
+                    {"$match": {"$expr": {"$and": [
+                        {"$eq": ["$employee_id", "$$employee_id"]},
+                        {"$eq": ["$date", day.isoformat()]},
+                    ]}}},
+                    {"$limit": 1},
+                    {"$project": {"_id": 1}},
+                ],
+                "as": "marked",
+            }},
+            {"$match": {"marked": {"$size": 0}}},
+            {"$project": {"_id": 0, "employee_id": 1}},
+        ]
+        return [employee["employee_id"] async for employee in self.get_employees().aggregate(pipeline)]
+
+    async def summary_counts(self) -> Dict[str, Dict[str, int]]:
+        pipeline = [
+            {"$group": {
+                "_id": {"employee_id": "$employee_id", "status": "$status"},
+                "count": {"$sum": 1},
+            }},
+        ]
+        counts: Dict[str, Dict[str, int]] = {}
+        async for row in self.get_collection().aggregate(pipeline):
+            key = row["_id"]
+            counts.setdefault(key["employee_id"], {})[key["status"]] = row["count"]
+        return counts
+
+    async def delete_for_employee(self, employee_id: str) -> int:
+        result = await self.get_collection().delete_many({"employee_id": employee_id})
+        return result.deleted_count
+
+    async def find_before(self, cutoff: date, limit: int) -> List[dict]:
+        cursor = self.get_collection().find({"date": {"$lt": cutoff.isoformat()}}).sort("date", 1).limit(limit)
+        return await cursor.to_list(None)
+
+    async def replace_many(self, documents: List[dict]) -> int:
+        if not documents:
+            return 0
+        result = await self.get_collection().bulk_write([
+            ReplaceOne(
+                {"employee_id": document["employee_id"], "date": document["date"]},
+                document,
+                upsert=True,
+            )
+            for document in documents
+        ], ordered=False)
+        return result.upserted_count + result.modified_count
+
+    async def delete_unchanged(self, documents: List[dict]) -> int:
+        if not documents:
+            return 0
+        result = await self.get_collection().bulk_write([
+            DeleteOne({"_id": document["_id"], "updated_at": document["updated_at"]})
+            for document in documents
+        ], ordered=False)
+        return result.deleted_count
+
+    async def latest_date(self) -> Optional[date]:
+        latest = await self.get_collection().find_one({}, {"date": 1}, sort=[("date", -1)])
+        return date.fromisoformat(latest["date"]) if latest else None
+
+
+class MongoTombstoneRepository(TombstoneRepository):
+    """Tombstone repository backed by MongoDB; a TTL index expires old markers."""
+
+    def __init__(self, retention_seconds: int, get_collection=get_tombstones_collection):
+        self.retention_seconds = retention_seconds
+        self.get_collection = get_collection
+
+    async def ensure_indexes(self):
+        await create_indexes(self.get_collection(), [
+            ([("deleted_at", ASCENDING)], {"expireAfterSeconds": self.retention_seconds}),
+        ])
+
+    async def record(self, kind: str, key: str, deleted_at: datetime):
+        await self.get_collection().insert_one({"kind": kind, "key": key, "deleted_at": deleted_at})
+
+    async def deleted_since(self, kind: str, since: datetime) -> List[str]:
+        cursor = self.get_collection().find(
+            {"deleted_at": {"$gt": since}, "kind": kind},
+            {"_id": 0, "key": 1},
+        )
+        return [tombstone["key"] async for tombstone in cursor]
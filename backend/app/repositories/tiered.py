@@ -0,0 +1,167 @@
+import heapq
+from datetime import date, datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from app.repositories.base import AttendanceRepository
+
+
+class TieredAttendanceRepository(AttendanceRepository):
+    """
+    Attendance repository over a hot tier and an archive tier.
+
+    The archival job moves old records to the archive and advances the
+    watermark (the latest archived date). Queries only touch the archive when
+    their date range reaches back to or before the watermark, so day-to-day
+    reads keep hitting the small hot tier and its indexes.
+    """
+
+    def __init__(self, hot: AttendanceRepository, archive: AttendanceRepository):
+        self.hot = hot
+        self.archive = archive
+        self.watermark: Optional[date] = None
+
+    async def load_watermark(self):
+        """Read the watermark from the archive tier."""
+        self.watermark = await self.archive.latest_date()
+
+    def advance_watermark(self, day: date):
+        """Record that everything up to `day` may now be in the archive."""
+        if self.watermark is None or day > self.watermark:
+            self.watermark = day
+
+    def reaches_archive(self, start_date: Optional[date]) -> bool:
+        """Check whether a range starting at `start_date` overlaps archived periods."""
+        if self.watermark is None:
+            return False
+        return start_date is None or start_date <= self.watermark
+
+    async def get(self, employee_id: str, day: date) -> Optional[dict]:
+        record = await self.hot.get(employee_id, day)
+        if record is None and self.reaches_archive(day):
+            record = await self.archive.get(employee_id, day)
+        return record
+
+    async def find(
+        self,
+        employee_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> List[dict]:
+        hot_records = await self.hot.find(employee_id, start_date, end_date)
+        if not self.reaches_archive(start_date):
+            return hot_records
+
+        archive_records = await self.archive.find(employee_id, start_date, end_date)
+        if not archive_records:
+            return hot_records
+
+        # Both tiers are sorted newest first. A record caught mid-move can be in
+        # both; the hot copy is the one that may have been updated since.
+        hot_keys = {(record["employee_id"], record["date"]) for record in hot_records}
+        archive_records = [
+            record for record in archive_records
+            if (record["employee_id"], record["date"]) not in hot_keys
+        ]
+        return list(heapq.merge(hot_records, archive_records, key=lambda record: record["date"], reverse=True))
+
+    async def status_batches(self, start_date: date, end_date: date) -> AsyncIterator[List[Tuple[str, str, str]]]:
+        # Archive first, so a hot copy of a record caught mid-move comes last and wins
+        if self.reaches_archive(start_date):
+            async for batch in self.archive.status_batches(start_date, end_date):
+                yield batch
+        async for batch in self.hot.status_batches(start_date, end_date):
+            yield batch
+
+    async def status_by_date(self, employee_id: str, start_date: date, end_date: date) -> Dict[str, str]:
+        statuses = await self.hot.status_by_date(employee_id, start_date, end_date)
+        if self.reaches_archive(start_date):
+            archived = await self.archive.status_by_date(employee_id, start_date, end_date)
+            statuses = {**archived, **statuses}
+        return statuses
+
+    async def changed_since(self, since: datetime) -> List[dict]:
+        records = await self.hot.changed_since(since)
+        if self.watermark is not None:
+            hot_keys = {(record["employee_id"], record["date"]) for record in records}
+            records.extend(
+                record for record in await self.archive.changed_since(since)
+                if (record["employee_id"], record["date"]) not in hot_keys
+            )
+        return records
+
+    async def upsert(self, employee_id: str, day: date, status: str, now: datetime) -> dict:
+        # Corrections to archived days stay in the archive so each day lives in one tier
+        if self.reaches_archive(day) and await self.archive.get(employee_id, day):
+            return await self.archive.upsert(employee_id, day, status, now)
+        return await self.hot.upsert(employee_id, day, status, now)
+
+    async def insert_many(self, documents: List[dict]) -> int:
+        return await self.hot.insert_many(documents)
+
+    async def count_by_status(self, day: date) -> Dict[str, int]:
+        if not self.reaches_archive(day):
+            return await self.hot.count_by_status(day)
+        # Past days are small enough to count from the merged records, which
+        # skip archive copies of records that are still hot
+        counts: Dict[str, int] = {}
+        for record in await self.find(start_date=day, end_date=day):
+            counts[record["status"]] = counts.get(record["status"], 0) + 1
+        return counts
+
+    async def unmarked_employee_ids(self, day: date) -> List[str]:
+        employee_ids = await self.hot.unmarked_employee_ids(day)
+        if self.reaches_archive(day):
+            archived = {record["employee_id"] for record in await self.archive.find(start_date=day, end_date=day)}
+            employee_ids = [employee_id for employee_id in employee_ids if employee_id not in archived]
+        return employee_ids
+
+    async def summary_counts(self) -> Dict[str, Dict[str, int]]:
+        counts = await self.hot.summary_counts()
+        if self.watermark is None:
+            return counts
+        for employee_id, archived in (await self.archive.summary_counts()).items():
+            by_status = counts.setdefault(employee_id, {})
+            for status, count in archived.items():
+                by_status[status] = by_status.get(status, 0) + count
+        # Records caught mid-move were counted in both tiers; drop their archive copies
+        for employee_id, status in await self.archived_copies_of_hot():
+            counts[employee_id][status] -= 1
+        return counts
+
+    async def archived_copies_of_hot(self) -> List[Tuple[str, str]]:
+        """
+        (employee_id, archived status) of records that are in both tiers.
+
+        Only hot records on or before the watermark can have an archive copy,
+        and outside an interrupted archival run there are few or none.
+        """
+        days_by_employee: Dict[str, List[str]] = {}
+        for record in await self.hot.find(end_date=self.watermark):
+            days_by_employee.setdefault(record["employee_id"], []).append(record["date"])
+
+        copies = []
+        for employee_id, days in days_by_employee.items():
+            archived = await self.archive.status_by_date(
+                employee_id, date.fromisoformat(min(days)), date.fromisoformat(max(days))
+            )
+            copies.extend((employee_id, archived[day]) for day in days if day in archived)
+        return copies
+
+    async def delete_for_employee(self, employee_id: str) -> int:
+        deleted = await self.hot.delete_for_employee(employee_id)
+        if self.watermark is not None:
+            deleted += await self.archive.delete_for_employee(employee_id)
+        return deleted
+
+    async def find_before(self, cutoff: date, limit: int) -> List[dict]:
+        return await self.hot.find_before(cutoff, limit)
+
+    async def replace_many(self, documents: List[dict]) -> int:
+        return await self.hot.replace_many(documents)
+
+    async def delete_unchanged(self, documents: List[dict]) -> int:
+        return await self.hot.delete_unchanged(documents)
+
+    async def latest_date(self) -> Optional[date]:
+        latest = await self.hot.latest_date()
+        return latest if latest is not None else self.watermark
@@ -1,6 +1,9 @@
 from app.routes.employees import router as employees_router
 from app.routes.attendance import router as attendance_router
+from app.routes.sync import router as sync_router
+from app.routes.events import router as events_router
+from app.routes.analytics import router as analytics_router
+from app.routes.bootstrap import router as bootstrap_router
+from app.routes.admin import router as admin_router
 
-__all__ = ["employees_router", "attendance_router"]
-
-
+__all__ = ["employees_router", "attendance_router", "sync_router", "events_router", "analytics_router", "bootstrap_router", "admin_router"]
@@ -0,0 +1,119 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from typing import List, Optional
+import hmac
+
+from app.config import get_settings
+from app.models.profiling import ProfilingSettings, ProfileSummary
+from app.profiling import ProfilingToggle, profile_store
+
+settings = get_settings()
+
+
+def is_admin_token(token: Optional[str]) -> bool:
+    """Check a token against the configured admin token (never matches when none is set)."""
+    return bool(settings.admin_token and token and hmac.compare_digest(
+        # Bytes, since header values are latin-1 and compare_digest rejects non-ASCII str
+        token.encode("latin-1"), settings.admin_token.encode("latin-1"),
+    ))
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None, description="Admin token")):
+    """Reject requests without the configured admin token."""
+    if not settings.admin_token:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Admin API is disabled"
+        )
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin token"
+        )
+
+
+router = APIRouter(prefix="/api/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get(
+    "/profiling",
+    response_model=ProfilingSettings,
+    summary="Get the profiling toggle",
+)
+async def get_profiling_settings():
+    """Get the current request profiling toggle."""
+    return ProfilingSettings(
+        enabled=ProfilingToggle.enabled,
+        sample_rate=ProfilingToggle.sample_rate,
+        path_prefix=ProfilingToggle.path_prefix,
+    )
+
+
+@router.put(
+    "/profiling",
+    response_model=ProfilingSettings,
+    summary="Set the profiling toggle",
+    description="Profile a random share of requests on this server process until switched off."
+)
+async def set_profiling_settings(toggle: ProfilingSettings):
+    """Switch sampled request profiling on or off."""
+    ProfilingToggle.enabled = toggle.enabled
+    ProfilingToggle.sample_rate = toggle.sample_rate
+    ProfilingToggle.path_prefix = toggle.path_prefix
+    return toggle
+
+
+@router.get(
+    "/profiles",
+    response_model=List[ProfileSummary],
+    summary="List recent profiles",
+    description="The most recent profiled requests, newest first, with time per category."
+)
+async def list_profiles():
+    """List recent request profiles."""
+    return [profile.summary() for profile in profile_store.list()]
+
+
+def get_profile_or_404(profile_id: int):
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile {profile_id} not found"
+        )
+    return profile
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    response_model=ProfileSummary,
+    summary="Get a profile",
+)
+async def get_profile(profile_id: int):
+    """Get the summary of a request profile."""
+    return get_profile_or_404(profile_id).summary()
+
+
+@router.get(
+    "/profiles/{profile_id}/collapsed",
+    response_class=PlainTextResponse,
+    summary="Get a profile as collapsed stacks",
+    description=(
+        "One `frame;frame;... count` line per distinct stack, rooted at the request and "
+        "its category ([cpu], [await_mongo], ...). Load into speedscope or flamegraph.pl."
+    ),
+)
+async def get_profile_collapsed(profile_id: int):
+    """Get a request profile in flamegraph-compatible collapsed-stack format."""
+    return get_profile_or_404(profile_id).collapsed()
+
+
+@router.delete(
+    "/profiles",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete all profiles",
+)
+async def clear_profiles():
+    """Delete all stored profiles."""
+    profile_store.clear()
+    return None
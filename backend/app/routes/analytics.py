@@ -0,0 +1,128 @@
+from fastapi import APIRouter, HTTPException, status, Query
+from typing import Optional, Tuple
+from datetime import date, timedelta
+
+from app.analytics import (
+    get_matrix,
+    department_rates,
+    rolling_rates,
+    chronic_absentees,
+    weekday_rates,
+)
+from app.config import get_settings
+from app.models.analytics import (
+    DepartmentAnalytics,
+    RollingAttendance,
+    AbsenteeAnalytics,
+    WeekdayAnalytics,
+)
+
+settings = get_settings()
+
+router = APIRouter(prefix="/api/analytics", tags=["Analytics"])
+
+
+def resolve_range(from_date: Optional[date], to_date: Optional[date]) -> Tuple[date, date]:
+    """Apply the default range and validate it, raising 400 if it is invalid."""
+    end_date = to_date or date.today()
+    start_date = from_date or end_date - timedelta(days=settings.analytics_default_days - 1)
+    num_days = (end_date - start_date).days + 1
+    if num_days < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' must not be after 'to'"
+        )
+    if num_days > settings.analytics_max_days:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range cannot exceed {settings.analytics_max_days} days"
+        )
+    return start_date, end_date
+
+
+@router.get(
+    "/departments",
+    response_model=DepartmentAnalytics,
+    summary="Get attendance per department",
+    description="Present and absent days and attendance rate per department over a date range (default: the last 90 days)."
+)
+async def get_department_analytics(
+    from_date: Optional[date] = Query(None, alias="from", description="First day of the range"),
+    to_date: Optional[date] = Query(None, alias="to", description="Last day of the range (default: today)"),
+):
+    """Get attendance totals per department."""
+    start_date, end_date = resolve_range(from_date, to_date)
+    matrix = await get_matrix(start_date, end_date)
+    return DepartmentAnalytics(
+        start_date=start_date,
+        end_date=end_date,
+        departments=department_rates(matrix),
+    )
+
+
+@router.get(
+    "/rolling",
+    response_model=RollingAttendance,
+    summary="Get rolling attendance rate",
+    description="Attendance rate for each day over a trailing window, for everyone or one department."
+)
+async def get_rolling_analytics(
+    from_date: Optional[date] = Query(None, alias="from", description="First day of the range"),
+    to_date: Optional[date] = Query(None, alias="to", description="Last day of the range (default: today)"),
+    window: int = Query(7, ge=1, le=366, description="Window length in days"),
+    department: Optional[str] = Query(None, description="Only include this department"),
+):
+    """Get a rolling attendance rate series."""
+    start_date, end_date = resolve_range(from_date, to_date)
+    matrix = await get_matrix(start_date, end_date)
+    return RollingAttendance(
+        start_date=start_date,
+        end_date=end_date,
+        window=window,
+        department=department,
+        rates=rolling_rates(matrix, window, department),
+    )
+
+
+@router.get(
+    "/absentees",
+    response_model=AbsenteeAnalytics,
+    summary="Get chronically absent employees",
+    description="Employees whose absence rate or longest run of absences meets the thresholds, worst first."
+)
+async def get_absentee_analytics(
+    from_date: Optional[date] = Query(None, alias="from", description="First day of the range"),
+    to_date: Optional[date] = Query(None, alias="to", description="Last day of the range (default: today)"),
+    min_absence_rate: float = Query(30, ge=0, le=100, description="Absence rate threshold, in percent of marked days"),
+    min_streak: int = Query(3, ge=1, description="Consecutive absences threshold"),
+):
+    """Get chronically absent employees."""
+    start_date, end_date = resolve_range(from_date, to_date)
+    matrix = await get_matrix(start_date, end_date)
+    return AbsenteeAnalytics(
+        start_date=start_date,
+        end_date=end_date,
+        absentees=chronic_absentees(matrix, min_absence_rate, min_streak),
+    )
+
+
+@router.get(
+    "/weekdays",
+    response_model=WeekdayAnalytics,
+    summary="Get attendance per day of the week",
+    description="Present and absent days and attendance rate for each day of the week."
+)
+async def get_weekday_analytics(
+    from_date: Optional[date] = Query(None, alias="from", description="First day of the range"),
+    to_date: Optional[date] = Query(None, alias="to", description="Last day of the range (default: today)"),
+    department: Optional[str] = Query(None, description="Only include this department"),
+):
+    """Get attendance totals per day of the week."""
+    start_date, end_date = resolve_range(from_date, to_date)
+    matrix = await get_matrix(start_date, end_date)
+    return WeekdayAnalytics(
+        start_date=start_date,
+        end_date=end_date,
+        department=department,
+        weekdays=weekday_rates(matrix, department),
+    )
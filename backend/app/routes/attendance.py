@@ -1,23 +1,42 @@
 from fastapi import APIRouter, HTTPException, status, Query
-from typing import List, Optional
-from datetime import datetime, date
-from bson import ObjectId
+from typing import Dict, List, Optional
+from datetime import datetime, date, timedelta
+import asyncio
 
 from app.models.attendance import (
     AttendanceCreate,
     AttendanceResponse,
     AttendanceStatus,
     AttendanceSummary,
+    AttendanceCalendar,
+    AttendanceStreak,
+    CloseDayReport,
 )
-from app.database import get_employees_collection, get_attendance_collection
+from app.repositories import get_employee_repository, get_attendance_repository
+from app.config import get_settings
+from app.close_day import close_day
+from app.analytics import record_attendance
+from app.cache import bump_data_version
+from app.directory import get_employee_directory
+from app.events import get_broker, publish_dashboard_delta, status_delta
+
+settings = get_settings()
 
 router = APIRouter(prefix="/api/attendance", tags=["Attendance"])
 
+# Calendar encoding - one character per day
+CALENDAR_CODES = {
+    AttendanceStatus.PRESENT.value: "P",
+    AttendanceStatus.ABSENT.value: "A",
+}
+CALENDAR_UNMARKED = "-"
+CALENDAR_DEFAULT_DAYS = 365
+CALENDAR_MAX_DAYS = 366 * 3
+
 
 async def get_employee_name(employee_id: str) -> Optional[str]:
     """Get employee name by employee_id."""
-    collection = get_employees_collection()
-    employee = await collection.find_one({"employee_id": employee_id})
+    employee = await get_employee_repository().get(employee_id)
     return employee["full_name"] if employee else None
 
 
@@ -43,53 +62,59 @@ def attendance_helper(attendance: dict, employee_name: Optional[str] = None) ->
 )
 async def mark_attendance(attendance: AttendanceCreate):
     """Mark or update attendance for an employee."""
-    employees_collection = get_employees_collection()
-    attendance_collection = get_attendance_collection()
+    employee_repository = get_employee_repository()
+    attendance_repository = get_attendance_repository()
     
     # Verify employee exists
-    employee = await employees_collection.find_one({"employee_id": attendance.employee_id})
+    employee = await employee_repository.get(attendance.employee_id)
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Employee with ID '{attendance.employee_id}' not found"
         )
     
-    now = datetime.utcnow()
-    
-    # Check if attendance already exists for this employee and date
-    existing = await attendance_collection.find_one({
-        "employee_id": attendance.employee_id,
-        "date": attendance.date.isoformat(),
-    })
+    # Live dashboards need the previous status to turn today's change into counter deltas
+    is_today = attendance.date == date.today()
+    previous = None
+    if is_today and get_broker().has_subscribers():
+        previous = await attendance_repository.get(attendance.employee_id, attendance.date)
     
-    if existing:
-        # Update existing attendance
-        await attendance_collection.update_one(
-            {"_id": existing["_id"]},
-            {
-                "$set": {
-                    "status": attendance.status.value,
-                    "updated_at": now,
-                }
-            }
-        )
-        existing["status"] = attendance.status.value
-        existing["updated_at"] = now
-        return attendance_helper(existing, employee["full_name"])
+    # Create the record, or update it if attendance for the date already exists
+    record = await attendance_repository.upsert(
+        attendance.employee_id,
+        attendance.date,
+        attendance.status.value,
+        datetime.utcnow(),
+    )
+    bump_data_version()
+    record_attendance([(record["employee_id"], record["date"], record["status"])])
     
-    # Create new attendance record
-    attendance_doc = {
-        "employee_id": attendance.employee_id,
-        "date": attendance.date.isoformat(),
-        "status": attendance.status.value,
-        "created_at": now,
-        "updated_at": now,
-    }
+    response = attendance_helper(record, employee["full_name"])
+    get_broker().publish("attendance", response)
+    if is_today:
+        publish_dashboard_delta(**status_delta(previous and previous["status"], record["status"]))
     
-    result = await attendance_collection.insert_one(attendance_doc)
-    attendance_doc["_id"] = result.inserted_id
+    return response
+
+
+@router.post(
+    "/close-day",
+    response_model=CloseDayReport,
+    summary="Close a day",
+    description="Mark every employee created by the date (default: today) and without attendance for it as Absent. Safe to run repeatedly."
+)
+async def close_attendance_day(
+    day: Optional[date] = Query(None, alias="date", description="Day to close (default: today)"),
+):
+    """Mark all unmarked employees absent for a day."""
+    day = day or date.today()
+    if day > date.today():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot close a future date"
+        )
     
-    return attendance_helper(attendance_doc, employee["full_name"])
+    return await close_day(day, settings.close_day_batch_size)
 
 
 @router.get(
@@ -103,31 +128,17 @@ async def get_all_attendance(
     end_date: Optional[date] = Query(None, description="Filter until this date"),
 ):
     """Get all attendance records with optional date filtering."""
-    attendance_collection = get_attendance_collection()
-    employees_collection = get_employees_collection()
+    attendance_repository = get_attendance_repository()
     
-    # Build query
-    query = {}
-    if start_date or end_date:
-        date_query = {}
-        if start_date:
-            date_query["$gte"] = start_date.isoformat()
-        if end_date:
-            date_query["$lte"] = end_date.isoformat()
-        query["date"] = date_query
-    
-    # Get all employees for name lookup
-    employees = {}
-    async for emp in employees_collection.find():
-        employees[emp["employee_id"]] = emp["full_name"]
-    
-    # Get attendance records
-    records = []
-    async for attendance in attendance_collection.find(query).sort("date", -1):
-        employee_name = employees.get(attendance["employee_id"])
-        records.append(attendance_helper(attendance, employee_name))
-    
-    return records
+    # Names come from the shared employee directory, records from one query
+    directory, records = await asyncio.gather(
+        get_employee_directory(),
+        attendance_repository.find(start_date=start_date, end_date=end_date),
+    )
+    return [
+        attendance_helper(attendance, directory.names.get(attendance["employee_id"]))
+        for attendance in records
+    ]
 
 
 @router.get(
@@ -142,33 +153,92 @@ async def get_employee_attendance(
     end_date: Optional[date] = Query(None, description="Filter until this date"),
 ):
     """Get attendance records for a specific employee."""
-    employees_collection = get_employees_collection()
-    attendance_collection = get_attendance_collection()
+    employee_repository = get_employee_repository()
+    attendance_repository = get_attendance_repository()
     
     # Verify employee exists
-    employee = await employees_collection.find_one({"employee_id": employee_id})
+    employee = await employee_repository.get(employee_id)
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Employee with ID '{employee_id}' not found"
         )
     
-    # Build query
-    query = {"employee_id": employee_id}
-    if start_date or end_date:
-        date_query = {}
-        if start_date:
-            date_query["$gte"] = start_date.isoformat()
-        if end_date:
-            date_query["$lte"] = end_date.isoformat()
-        query["date"] = date_query
-    
     # Get attendance records
-    records = []
-    async for attendance in attendance_collection.find(query).sort("date", -1):
-        records.append(attendance_helper(attendance, employee["full_name"]))
+    records = await attendance_repository.find(
+        employee_id=employee_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    return [attendance_helper(attendance, employee["full_name"]) for attendance in records]
+
+
+@router.get(
+    "/employee/{employee_id}/calendar",
+    response_model=AttendanceCalendar,
+    summary="Get attendance calendar for an employee",
+    description="Compact per-day attendance for a date range (default: the last year), with totals and current streak."
+)
+async def get_employee_attendance_calendar(
+    employee_id: str,
+    from_date: Optional[date] = Query(None, alias="from", description="First day of the range"),
+    to_date: Optional[date] = Query(None, alias="to", description="Last day of the range (default: today)"),
+):
+    """Get an employee's attendance over a date range as one character per day."""
+    employee_repository = get_employee_repository()
+    attendance_repository = get_attendance_repository()
     
-    return records
+    end_date = to_date or date.today()
+    start_date = from_date or end_date - timedelta(days=CALENDAR_DEFAULT_DAYS - 1)
+    num_days = (end_date - start_date).days + 1
+    if num_days < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' must not be after 'to'"
+        )
+    if num_days > CALENDAR_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range cannot exceed {CALENDAR_MAX_DAYS} days"
+        )
+    
+    # Verify employee exists
+    employee = await employee_repository.get(employee_id)
+    if not employee:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Employee with ID '{employee_id}' not found"
+        )
+    
+    # Dates and statuses only, from the (employee_id, date) index
+    statuses = await attendance_repository.status_by_date(employee_id, start_date, end_date)
+    days = "".join(
+        CALENDAR_CODES.get(statuses.get((start_date + timedelta(days=offset)).isoformat()), CALENDAR_UNMARKED)
+        for offset in range(num_days)
+    )
+    
+    # Current streak: same-status run ending on the most recent marked day
+    marked = days.rstrip(CALENDAR_UNMARKED)
+    streak = AttendanceStreak()
+    if marked:
+        code = marked[-1]
+        streak = AttendanceStreak(
+            status=AttendanceStatus.PRESENT if code == "P" else AttendanceStatus.ABSENT,
+            days=len(marked) - len(marked.rstrip(code)),
+        )
+    
+    total_present = days.count("P")
+    total_absent = days.count("A")
+    return AttendanceCalendar(
+        employee_id=employee_id,
+        start_date=start_date,
+        end_date=end_date,
+        days=days,
+        total_present=total_present,
+        total_absent=total_absent,
+        total_unmarked=num_days - total_present - total_absent,
+        current_streak=streak,
+    )
 
 
 @router.get(
@@ -179,24 +249,22 @@ async def get_employee_attendance(
 )
 async def get_attendance_summary():
     """Get attendance summary for all employees."""
-    employees_collection = get_employees_collection()
-    attendance_collection = get_attendance_collection()
-    
+    # One grouped count for every employee instead of two queries each
+    directory, counts = await asyncio.gather(
+        get_employee_directory(),
+        get_attendance_repository().summary_counts(),
+    )
+    return summary_rows(directory.employees, counts)
+
+
+def summary_rows(employees: List[dict], counts: Dict[str, Dict[str, int]]) -> List[AttendanceSummary]:
+    """Build summary rows from employees and their per-status record counts."""
     summaries = []
-    
-    async for employee in employees_collection.find():
+    for employee in employees:
         employee_id = employee["employee_id"]
-        
-        # Count present and absent days
-        present_count = await attendance_collection.count_documents({
-            "employee_id": employee_id,
-            "status": AttendanceStatus.PRESENT.value,
-        })
-        
-        absent_count = await attendance_collection.count_documents({
-            "employee_id": employee_id,
-            "status": AttendanceStatus.ABSENT.value,
-        })
+        employee_counts = counts.get(employee_id, {})
+        present_count = employee_counts.get(AttendanceStatus.PRESENT.value, 0)
+        absent_count = employee_counts.get(AttendanceStatus.ABSENT.value, 0)
         
         summaries.append(AttendanceSummary(
             employee_id=employee_id,
@@ -207,5 +275,3 @@ async def get_attendance_summary():
         ))
     
     return summaries
-
-
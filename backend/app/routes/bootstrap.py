@@ -0,0 +1,74 @@
+from fastapi import APIRouter, Query
+from typing import Optional
+from datetime import date
+import asyncio
+
+from app.directory import get_employee_directory
+from app.models.attendance import AttendanceStatus
+from app.models.bootstrap import BootstrapPage, BootstrapResponse, DashboardStats
+from app.repositories import get_attendance_repository
+from app.routes.attendance import attendance_helper, summary_rows
+
+router = APIRouter(prefix="/api/bootstrap", tags=["Bootstrap"])
+
+
+def dashboard_stats(total_employees: int, today_statuses: dict, today: date) -> DashboardStats:
+    """Today's counters from the status of each employee marked today."""
+    present_today = sum(1 for value in today_statuses.values() if value == AttendanceStatus.PRESENT.value)
+    absent_today = sum(1 for value in today_statuses.values() if value == AttendanceStatus.ABSENT.value)
+    marked = present_today + absent_today
+    return DashboardStats(
+        total_employees=total_employees,
+        present_today=present_today,
+        absent_today=absent_today,
+        attendance_rate=round(present_today / marked * 100, 1) if marked else 0.0,
+        date=today,
+    )
+
+
+@router.get(
+    "/{page}",
+    response_model=BootstrapResponse,
+    summary="Get a page's initial data",
+    description=(
+        "Everything a page needs on first load in one response: dashboard stats, today's "
+        "attendance and the employee ID to name map, plus the attendance summary (dashboard) "
+        "or the attendance records within start_date/end_date (attendance)."
+    ),
+)
+async def get_page_bootstrap(
+    page: BootstrapPage,
+    start_date: Optional[date] = Query(None, description="Attendance page: filter from this date"),
+    end_date: Optional[date] = Query(None, description="Attendance page: filter until this date"),
+):
+    """Gather a page's data concurrently over the shared employee directory."""
+    attendance_repository = get_attendance_repository()
+    today = date.today()
+    
+    if page == BootstrapPage.DASHBOARD:
+        page_data = attendance_repository.summary_counts()
+    else:
+        page_data = attendance_repository.find(start_date=start_date, end_date=end_date)
+    
+    directory, today_records, page_result = await asyncio.gather(
+        get_employee_directory(),
+        attendance_repository.find(start_date=today, end_date=today),
+        page_data,
+    )
+    
+    if page == BootstrapPage.DASHBOARD:
+        page_fields = {"summary": summary_rows(directory.employees, page_result)}
+    else:
+        page_fields = {"attendance": [
+            attendance_helper(record, directory.names.get(record["employee_id"]))
+            for record in page_result
+        ]}
+    
+    today_statuses = {record["employee_id"]: record["status"] for record in today_records}
+    return BootstrapResponse(
+        page=page,
+        stats=dashboard_stats(len(directory.employees), today_statuses, today),
+        employees=directory.names,
+        today=today_statuses,
+        **page_fields,
+    )
@@ -3,7 +3,7 @@ from pydantic import BaseModel
 from datetime import date
 
 from app.models.attendance import AttendanceStatus
-from app.database import get_employees_collection, get_attendance_collection
+from app.repositories import get_employee_repository, get_attendance_repository
 
 router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
 
@@ -24,25 +24,16 @@ class DashboardStats(BaseModel):
 )
 async def get_dashboard_stats():
     """Get dashboard statistics."""
-    employees_collection = get_employees_collection()
-    attendance_collection = get_attendance_collection()
+    employee_repository = get_employee_repository()
+    attendance_repository = get_attendance_repository()
     
     # Get total employees
-    total_employees = await employees_collection.count_documents({})
-    
-    # Get today's date
-    today = date.today().isoformat()
+    total_employees = await employee_repository.count()
     
     # Get today's attendance counts
-    present_today = await attendance_collection.count_documents({
-        "date": today,
-        "status": AttendanceStatus.PRESENT.value,
-    })
-    
-    absent_today = await attendance_collection.count_documents({
-        "date": today,
-        "status": AttendanceStatus.ABSENT.value,
-    })
+    counts = await attendance_repository.count_by_status(date.today())
+    present_today = counts.get(AttendanceStatus.PRESENT.value, 0)
+    absent_today = counts.get(AttendanceStatus.ABSENT.value, 0)
     
     # Calculate attendance rate
     total_marked_today = present_today + absent_today
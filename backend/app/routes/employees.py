@@ -1,10 +1,22 @@
 from fastapi import APIRouter, HTTPException, status
 from typing import List
-from datetime import datetime
-from bson import ObjectId
+from datetime import datetime, date
 
-from app.models.employee import EmployeeCreate, EmployeeResponse
-from app.database import get_employees_collection, get_attendance_collection
+from app.models.employee import (
+    EmployeeCreate,
+    EmployeeResponse,
+    EmployeeBatchGetRequest,
+    EmployeeBatchGetResponse,
+)
+from app.repositories import (
+    get_employee_repository,
+    get_attendance_repository,
+    get_tombstone_repository,
+)
+from app.analytics import record_employee_created, record_employee_deleted
+from app.cache import bump_employee_version
+from app.directory import get_employee_directory, peek_employee_directory
+from app.events import get_broker, publish_dashboard_delta, status_delta
 
 router = APIRouter(prefix="/api/employees", tags=["Employees"])
 
@@ -31,10 +43,10 @@ def employee_helper(employee: dict) -> dict:
 )
 async def create_employee(employee: EmployeeCreate):
     """Create a new employee."""
-    collection = get_employees_collection()
+    repository = get_employee_repository()
     
     # Check for duplicate employee_id
-    existing_by_id = await collection.find_one({"employee_id": employee.employee_id})
+    existing_by_id = await repository.get(employee.employee_id)
     if existing_by_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -42,7 +54,7 @@ async def create_employee(employee: EmployeeCreate):
         )
     
     # Check for duplicate email
-    existing_by_email = await collection.find_one({"email": employee.email})
+    existing_by_email = await repository.get_by_email(employee.email)
     if existing_by_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -57,8 +69,10 @@ async def create_employee(employee: EmployeeCreate):
         "updated_at": now,
     }
     
-    result = await collection.insert_one(employee_doc)
-    employee_doc["_id"] = result.inserted_id
+    employee_doc = await repository.create(employee_doc)
+    bump_employee_version()
+    record_employee_created(employee_doc["employee_id"], employee_doc["department"])
+    publish_dashboard_delta(total_employees=1)
     
     return employee_helper(employee_doc)
 
@@ -71,13 +85,40 @@ async def create_employee(employee: EmployeeCreate):
 )
 async def get_all_employees():
     """Get all employees."""
-    collection = get_employees_collection()
-    employees = []
+    directory = await get_employee_directory()
+    return [employee_helper(employee) for employee in directory.employees]
+
+
+@router.post(
+    "/batch-get",
+    response_model=EmployeeBatchGetResponse,
+    summary="Get employees by IDs",
+    description="Look up many employees in one request. Returns found employees keyed by ID and the IDs that do not exist."
+)
+async def batch_get_employees(request: EmployeeBatchGetRequest):
+    """Get several employees from the shared employee directory, or one $in query."""
+    # Drop duplicates, keeping request order for the missing list
+    employee_ids = list(dict.fromkeys(request.employee_ids))
     
-    async for employee in collection.find().sort("created_at", -1):
-        employees.append(employee_helper(employee))
+    # Reading every employee to answer for a few is only worth it if they are already in memory
+    directory = peek_employee_directory()
+    if directory is not None:
+        by_id = directory.by_id
+    else:
+        by_id = await get_employee_repository().get_many(employee_ids)
+    found = {
+        employee_id: by_id[employee_id]
+        for employee_id in employee_ids
+        if employee_id in by_id
+    }
     
-    return employees
+    return {
+        "employees": {
+            employee_id: employee_helper(employee)
+            for employee_id, employee in found.items()
+        },
+        "missing": [employee_id for employee_id in employee_ids if employee_id not in found],
+    }
 
 
 @router.get(
@@ -88,9 +129,9 @@ async def get_all_employees():
 )
 async def get_employee(employee_id: str):
     """Get a specific employee by employee_id."""
-    collection = get_employees_collection()
+    repository = get_employee_repository()
     
-    employee = await collection.find_one({"employee_id": employee_id})
+    employee = await repository.get(employee_id)
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -108,22 +149,38 @@ async def get_employee(employee_id: str):
 )
 async def delete_employee(employee_id: str):
     """Delete an employee and their attendance records."""
-    employees_collection = get_employees_collection()
-    attendance_collection = get_attendance_collection()
+    employee_repository = get_employee_repository()
+    attendance_repository = get_attendance_repository()
     
     # Check if employee exists
-    employee = await employees_collection.find_one({"employee_id": employee_id})
+    employee = await employee_repository.get(employee_id)
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Employee with ID '{employee_id}' not found"
         )
     
+    # Today's status, so live dashboards can take it off the counters
+    today_record = None
+    if get_broker().has_subscribers():
+        today_record = await attendance_repository.get(employee_id, date.today())
+    
     # Delete employee's attendance records
-    await attendance_collection.delete_many({"employee_id": employee_id})
+    await attendance_repository.delete_for_employee(employee_id)
     
     # Delete employee
-    await employees_collection.delete_one({"employee_id": employee_id})
+    await employee_repository.delete(employee_id)
+    
+    # Leave a tombstone so sync clients drop the employee and their attendance
+    await get_tombstone_repository().record("employee", employee_id, datetime.utcnow())
+    bump_employee_version()
+    record_employee_deleted(employee_id)
+    
+    get_broker().publish("employee_deleted", {"employee_id": employee_id})
+    publish_dashboard_delta(
+        total_employees=-1,
+        **status_delta(today_record and today_record["status"], None),
+    )
     
     return None
 
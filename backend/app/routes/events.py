@@ -0,0 +1,41 @@
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app.config import get_settings
+from app.events import get_broker, event_stream
+
+settings = get_settings()
+
+router = APIRouter(prefix="/api/events", tags=["Events"])
+
+
+@router.get(
+    "",
+    summary="Stream live updates",
+    description=(
+        "Server-Sent Events stream. `dashboard` events carry changes to today's counters "
+        "(e.g. {\"present_today\": 1, \"absent_today\": -1}), `attendance` events carry "
+        "created or updated records, and `employee_deleted` events carry the deleted ID. "
+        "Idle streams get a heartbeat comment; clients that fall behind are disconnected "
+        "and should refetch after reconnecting."
+    ),
+    response_class=StreamingResponse,
+)
+async def stream_events():
+    """Stream live dashboard and attendance updates."""
+    broker = get_broker()
+    if len(broker.subscribers) >= settings.events_max_subscribers:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many live update connections, please retry shortly"
+        )
+    
+    subscriber = broker.subscribe()
+    return StreamingResponse(
+        event_stream(subscriber, settings.events_heartbeat_seconds),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -0,0 +1,96 @@
+from fastapi import APIRouter, HTTPException, status, Query
+from typing import Optional
+from datetime import datetime, timedelta
+
+from app.config import get_settings
+from app.models.sync import SyncResponse
+from app.repositories import (
+    get_employee_repository,
+    get_attendance_repository,
+    get_tombstone_repository,
+)
+from app.routes.employees import employee_helper
+from app.routes.attendance import attendance_helper
+
+settings = get_settings()
+
+router = APIRouter(prefix="/api/sync", tags=["Sync"])
+
+EPOCH = datetime(1970, 1, 1)
+
+# New tokens trail the clock so writes stamped just before a sync but
+# committed just after it are picked up next time. Clients may see a
+# record twice; applying changes is idempotent.
+SYNC_SAFETY_WINDOW = timedelta(seconds=5)
+
+
+def encode_token(moment: datetime) -> str:
+    """Encode a UTC timestamp as an opaque sync token."""
+    return str(int((moment - EPOCH).total_seconds() * 1000))
+
+
+def decode_token(token: str) -> datetime:
+    """Decode a sync token, raising 400 if it is malformed."""
+    try:
+        return EPOCH + timedelta(milliseconds=int(token))
+    except (ValueError, OverflowError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid sync token '{token}'"
+        )
+
+
+@router.get(
+    "",
+    response_model=SyncResponse,
+    summary="Get changes since a sync token",
+    description=(
+        "Return employees and attendance changed since `since`, plus deleted employees. "
+        "Apply deletions first, then upserts. Without a token, or with one older than "
+        "the tombstone retention, a full snapshot is returned (`full` is true)."
+    )
+)
+async def sync_changes(
+    since: Optional[str] = Query(None, description="Token from the previous sync"),
+):
+    """Get changes since the last sync."""
+    employee_repository = get_employee_repository()
+    attendance_repository = get_attendance_repository()
+    
+    now = datetime.utcnow()
+    token = encode_token(now - SYNC_SAFETY_WINDOW)
+    
+    since_time = decode_token(since) if since else None
+    retention = timedelta(days=settings.sync_tombstone_retention_days)
+    if since_time is None or since_time < now - retention:
+        # Deletions may have expired, so the client must start over
+        employees = await employee_repository.list_all()
+        names = {employee["employee_id"]: employee["full_name"] for employee in employees}
+        records = await attendance_repository.find()
+        return {
+            "token": token,
+            "full": True,
+            "employees": [employee_helper(employee) for employee in employees],
+            "attendance": [attendance_helper(record, names.get(record["employee_id"])) for record in records],
+            "deleted_employees": [],
+        }
+    
+    # Changes only, through the updated_at and deleted_at indexes
+    employees = await employee_repository.changed_since(since_time)
+    records = await attendance_repository.changed_since(since_time)
+    deleted = await get_tombstone_repository().deleted_since("employee", since_time)
+    
+    # Names only for the employees the changed records refer to
+    names = {employee["employee_id"]: employee["full_name"] for employee in employees}
+    missing_names = {record["employee_id"] for record in records} - names.keys()
+    if missing_names:
+        for employee_id, employee in (await employee_repository.get_many(missing_names)).items():
+            names[employee_id] = employee["full_name"]
+    
+    return {
+        "token": token,
+        "full": False,
+        "employees": [employee_helper(employee) for employee in employees],
+        "attendance": [attendance_helper(record, names.get(record["employee_id"])) for record in records],
+        "deleted_employees": deleted,
+    }
@@ -0,0 +1,58 @@
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# Tenant IDs end up in database names, so keep them short and plain
+TENANT_ID_PATTERN = re.compile(r"^[a-z0-9][a-z0-9_-]{0,31}$")
+
+current_tenant: ContextVar[str] = ContextVar("current_tenant", default=settings.default_tenant)
+
+
+def get_current_tenant() -> str:
+    """Get the tenant of the current request (or background job)."""
+    return current_tenant.get()
+
+
+def get_tenant_ids() -> List[str]:
+    """Get all tenants served by this deployment, the default tenant first."""
+    return [settings.default_tenant] + [
+        tenant for tenant in settings.tenants if tenant != settings.default_tenant
+    ]
+
+
+def validate_tenant_ids():
+    """Fail fast on configured tenant IDs that cannot be used as database names."""
+    for tenant in get_tenant_ids():
+        if not TENANT_ID_PATTERN.match(tenant):
+            raise ValueError(f"Invalid tenant ID '{tenant}'")
+
+
+def is_known_tenant(tenant: str) -> bool:
+    """Check whether a tenant is served by this deployment."""
+    return tenant == settings.default_tenant or tenant in settings.tenants
+
+
+@contextmanager
+def tenant_context(tenant: str) -> Iterator[None]:
+    """Run a block (e.g. one tenant's share of a background job) as `tenant`."""
+    token = current_tenant.set(tenant)
+    try:
+        yield
+    finally:
+        current_tenant.reset(token)
+
+
+def tenant_from_host(host: str, base_domain: str) -> Optional[str]:
+    """Get the tenant from a `<tenant>.<base_domain>` host, if it is one."""
+    if not base_domain:
+        return None
+    hostname = host.split(":", 1)[0].lower()
+    suffix = "." + base_domain.lower()
+    if not hostname.endswith(suffix):
+        return None
+    return hostname[:-len(suffix)] or None
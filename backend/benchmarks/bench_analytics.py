@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Analytics Benchmark for HRMS Lite
+Times the attendance matrix analytics on a synthetic employee x day matrix,
+the streamed matrix build from the in-memory storage backend (by default at
+the same size; 10k x 730 needs about 5 GB of RAM), and applying attendance
+writes to a cached matrix in place.
+
+Usage: python benchmarks/bench_analytics.py [--employees N] [--days N] [--load-employees N] [--load-days N]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["STORAGE_BACKEND"] = "memory"
+
+import numpy as np  # noqa: E402
+
+from app.analytics import (  # noqa: E402
+    ABSENT,
+    PRESENT,
+    UNMARKED,
+    AttendanceMatrix,
+    chronic_absentees,
+    department_rates,
+    get_matrix,
+    record_attendance,
+    rolling_rates,
+    weekday_rates,
+)
+from app.repositories import get_employee_repository, get_attendance_repository  # noqa: E402
+
+DEPARTMENTS = ["Engineering", "Human Resources", "Finance", "Sales", "Marketing", "Operations"]
+
+
+def synthetic_matrix(num_employees: int, num_days: int) -> AttendanceMatrix:
+    """Mostly present, some absences, a few unmarked days."""
+    rng = np.random.default_rng(42)
+    statuses = rng.choice(
+        np.array([PRESENT, ABSENT, UNMARKED], dtype=np.int8),
+        size=(num_employees, num_days),
+        p=[0.85, 0.1, 0.05],
+    )
+    return AttendanceMatrix(
+        employee_ids=[f"EMP{i:05d}" for i in range(num_employees)],
+        department_names=DEPARTMENTS,
+        departments=np.arange(num_employees) % len(DEPARTMENTS),
+        start_date=date.today() - timedelta(days=num_days - 1),
+        statuses=statuses,
+    )
+
+
+def timed(label: str, func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    print(f"   {label:<40} {(time.perf_counter() - started) * 1000:>9.1f} ms")
+    return result
+
+
+async def bench_load(num_employees: int, num_days: int):
+    """Seed the memory backend, time one streamed matrix build, then in-place updates."""
+    employee_repository = get_employee_repository()
+    attendance_repository = get_attendance_repository()
+    now = datetime.utcnow()
+    # Shared strings keep the seeded store as small as possible
+    employee_ids = [f"EMP{i:05d}" for i in range(num_employees)]
+    for i in range(num_employees):
+        await employee_repository.create({
+            "employee_id": employee_ids[i],
+            "full_name": f"Employee Number {i}",
+            "email": f"employee{i}@example.com",
+            "department": DEPARTMENTS[i % len(DEPARTMENTS)],
+            "created_at": now,
+            "updated_at": now,
+        })
+    start = date.today() - timedelta(days=num_days - 1)
+    for d in range(num_days):
+        day = (start + timedelta(days=d)).isoformat()
+        await attendance_repository.insert_many([
+            {
+                "employee_id": employee_ids[i],
+                "date": day,
+                "status": "Present" if (i + d) % 7 else "Absent",
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(num_employees)
+        ])
+
+    started = time.perf_counter()
+    matrix = await get_matrix(start, date.today())
+    elapsed = time.perf_counter() - started
+    records = num_employees * num_days
+    print(f"   {'build_matrix (cold cache)':<40} {elapsed * 1000:>9.1f} ms")
+    print(f"   {'records/s':<40} {records / elapsed:>12,.0f}")
+
+    # What each write costs now that it updates the cached matrix in place
+    today = date.today().isoformat()
+    marks = 1000
+    started = time.perf_counter()
+    for i in range(marks):
+        record_attendance([(employee_ids[i % num_employees], today, "Absent")])
+    print(f"   {'record_attendance (one mark)':<40} {(time.perf_counter() - started) * 1e6 / marks:>9.1f} us")
+    started = time.perf_counter()
+    record_attendance([(employee_id, today, "Absent") for employee_id in employee_ids], overwrite=False)
+    print(f"   {'record_attendance (close day, all)':<40} {(time.perf_counter() - started) * 1000:>9.1f} ms")
+    started = time.perf_counter()
+    assert await get_matrix(start, date.today()) is matrix
+    print(f"   {'get_matrix (after writes)':<40} {(time.perf_counter() - started) * 1000:>9.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=10000)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--load-employees", type=int, help="default: --employees")
+    parser.add_argument("--load-days", type=int, help="default: --days")
+    args = parser.parse_args()
+    args.load_employees = args.load_employees or args.employees
+    args.load_days = args.load_days or args.days
+
+    print("=" * 60)
+    print("HRMS Lite Analytics Benchmark")
+    print("=" * 60)
+
+    print(f"\nAnalytics on {args.employees} employees x {args.days} days\n")
+    matrix = synthetic_matrix(args.employees, args.days)
+    started = time.perf_counter()
+    timed("department_rates", department_rates, matrix)
+    timed("rolling_rates (7 day)", rolling_rates, matrix, 7)
+    timed("rolling_rates (30 day, one department)", rolling_rates, matrix, 30, "Sales")
+    timed("chronic_absentees", chronic_absentees, matrix, 30.0, 3)
+    timed("weekday_rates", weekday_rates, matrix)
+    print(f"   {'total':<40} {(time.perf_counter() - started) * 1000:>9.1f} ms")
+
+    print(f"\nMatrix build from memory backend, {args.load_employees} employees x {args.load_days} days\n")
+    asyncio.run(bench_load(args.load_employees, args.load_days))
+
+
+if __name__ == "__main__":
+    main()
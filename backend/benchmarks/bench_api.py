@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+API Benchmark for HRMS Lite
+Seeds the in-memory storage backend and times the read endpoints in-process,
+so route and serialization cost can be measured without a running mongod.
+
+Usage: python benchmarks/bench_api.py [--employees N] [--days N]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["STORAGE_BACKEND"] = "memory"
+os.environ.setdefault("COMPRESSION_ENABLED", "false")
+os.environ.setdefault("ADMISSION_ENABLED", "false")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.repositories import get_employee_repository, get_attendance_repository  # noqa: E402
+
+DEPARTMENTS = ["Engineering", "Human Resources", "Finance", "Sales", "Marketing", "Operations"]
+
+
+async def seed(num_employees: int, num_days: int):
+    """Fill the repositories through their batch operations."""
+    employee_repository = get_employee_repository()
+    attendance_repository = get_attendance_repository()
+    now = datetime.utcnow()
+
+    for i in range(num_employees):
+        await employee_repository.create({
+            "employee_id": f"EMP{i:05d}",
+            "full_name": f"Employee Number {i}",
+            "email": f"employee{i}@example.com",
+            "department": DEPARTMENTS[i % len(DEPARTMENTS)],
+            "created_at": now,
+            "updated_at": now,
+        })
+
+    start = date.today() - timedelta(days=num_days - 1)
+    for d in range(num_days):
+        day = (start + timedelta(days=d)).isoformat()
+        await attendance_repository.insert_many([
+            {
+                "employee_id": f"EMP{i:05d}",
+                "date": day,
+                "status": "Present" if (i + d) % 7 else "Absent",
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(num_employees)
+        ])
+
+
+def bench(client: TestClient, path: str, repeat: int) -> tuple:
+    """Return (median ms, response bytes)."""
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(path)
+        timings.append(time.perf_counter() - started)
+        assert response.status_code == 200, f"{path}: {response.status_code} {response.text}"
+        size = len(response.content)
+    return statistics.median(timings) * 1000, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("HRMS Lite API Benchmark (memory backend)")
+    print("=" * 60)
+
+    with TestClient(app) as client:
+        started = time.perf_counter()
+        client.portal.call(seed, args.employees, args.days)
+        print(f"\nSeeded {args.employees} employees x {args.days} days in {time.perf_counter() - started:.2f}s\n")
+
+        today = date.today().isoformat()
+        paths = [
+            "/api/dashboard/stats",
+            "/api/employees",
+            "/api/attendance/summary",
+            f"/api/attendance?start_date={today}&end_date={today}",
+            "/api/attendance",
+            "/api/attendance/employee/EMP00000",
+            "/api/bootstrap/dashboard",
+            f"/api/bootstrap/attendance?start_date={today}&end_date={today}",
+        ]
+        print(f"   {'endpoint':<56} {'ms':>9} {'bytes':>12}")
+        for path in paths:
+            millis, size = bench(client, path, args.repeat)
+            print(f"   {path:<56} {millis:>9.2f} {size:>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Compression Benchmark for HRMS Lite
+Measures CPU cost vs. bytes saved for each codec on payloads shaped like the
+list endpoints (employees, attendance), so compression levels in
+app/config.py can be tuned with numbers instead of guesses.
+
+Usage: python benchmarks/bench_compression.py [--employees N] [--days N]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.middleware.compression import brotli, zstandard  # noqa: E402
+
+DEPARTMENTS = ["Engineering", "Human Resources", "Finance", "Sales", "Marketing", "Operations"]
+
+
+def build_payloads(num_employees: int, num_days: int) -> dict:
+    """Build JSON bodies matching the API response shapes."""
+    now = datetime(2024, 1, 1, 9, 30)
+    employees = [
+        {
+            "id": f"65a1b2c3d4e5f6{i:010x}",
+            "employee_id": f"EMP{i:05d}",
+            "full_name": f"Employee Number {i}",
+            "email": f"employee{i}@example.com",
+            "department": DEPARTMENTS[i % len(DEPARTMENTS)],
+            "created_at": (now + timedelta(minutes=i)).isoformat(),
+            "updated_at": (now + timedelta(minutes=i)).isoformat(),
+        }
+        for i in range(num_employees)
+    ]
+    start = date(2024, 1, 1)
+    attendance = [
+        {
+            "id": f"65b1b2c3d4e5f6{i * num_days + d:010x}",
+            "employee_id": f"EMP{i:05d}",
+            "date": (start + timedelta(days=d)).isoformat(),
+            "status": "Present" if (i + d) % 7 else "Absent",
+            "employee_name": f"Employee Number {i}",
+            "created_at": (now + timedelta(days=d, seconds=i)).isoformat(),
+            "updated_at": (now + timedelta(days=d, seconds=i)).isoformat(),
+        }
+        for d in range(num_days)
+        for i in range(num_employees)
+    ]
+    return {
+        "employees": json.dumps(employees).encode(),
+        "attendance": json.dumps(attendance).encode(),
+    }
+
+
+def build_codecs() -> dict:
+    """All codec/level combinations worth comparing."""
+    codecs = {f"gzip-{level}": (lambda data, level=level: gzip.compress(data, compresslevel=level, mtime=0)) for level in (1, 6, 9)}
+    if brotli is not None:
+        for quality in (1, 5, 9, 11):
+            codecs[f"br-{quality}"] = lambda data, quality=quality: brotli.compress(data, quality=quality, mode=brotli.MODE_TEXT)
+    else:
+        print("   (brotli not installed - skipping br)")
+    if zstandard is not None:
+        for level in (1, 3, 9, 19):
+            codecs[f"zstd-{level}"] = zstandard.ZstdCompressor(level=level).compress
+    else:
+        print("   (zstandard not installed - skipping zstd)")
+    return codecs
+
+
+def bench(codec, data: bytes, repeat: int) -> tuple:
+    """Return (median seconds, compressed size)."""
+    timings = []
+    compressed = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        compressed = codec(data)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), len(compressed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print("HRMS Lite Compression Benchmark")
+    print("=" * 72)
+
+    payloads = build_payloads(args.employees, args.days)
+    codecs = build_codecs()
+
+    for name, data in payloads.items():
+        print(f"\n{name}: {len(data):,} bytes raw")
+        print(f"   {'codec':<10} {'size':>12} {'ratio':>7} {'ms':>9} {'MB/s':>8} {'saved KB/ms':>12}")
+        for codec_name, codec in codecs.items():
+            seconds, size = bench(codec, data, args.repeat)
+            millis = seconds * 1000
+            saved_per_ms = (len(data) - size) / 1024 / millis if millis else 0.0
+            print(
+                f"   {codec_name:<10} {size:>12,} {len(data) / size:>6.1f}x "
+                f"{millis:>9.2f} {len(data) / seconds / 1e6:>8.1f} {saved_per_ms:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,19 +3,46 @@
 API Integration Test Script for HRMS Lite
 Run this script to test all API endpoints after setting up MongoDB.
 
-Usage: python test_api.py
+Usage: python test_api.py               # against a running server
+       python test_api.py --in-process  # in-process with the memory storage backend
 """
 
+import os
 import requests
 import sys
-from datetime import date
+from datetime import date, timedelta
 
 BASE_URL = "http://localhost:8000"
 
+
+class LiveClient:
+    """Sends requests to the server at BASE_URL."""
+    
+    def get(self, path, **kwargs):
+        return requests.get(f"{BASE_URL}{path}", **kwargs)
+    
+    def post(self, path, **kwargs):
+        return requests.post(f"{BASE_URL}{path}", **kwargs)
+    
+    def put(self, path, **kwargs):
+        return requests.put(f"{BASE_URL}{path}", **kwargs)
+    
+    def delete(self, path, **kwargs):
+        return requests.delete(f"{BASE_URL}{path}", **kwargs)
+
+
+client = LiveClient()
+
+
+def directory_loads():
+    """How often the default tenant's employee directory was read from storage."""
+    series = client.get("/metrics").json()["counters"].get("employee_directory_cache_total", [])
+    return sum(s["value"] for s in series if s["labels"] == {"result": "miss", "tenant": "default"})
+
 def test_health():
     """Test health endpoint."""
     print("\n1. Testing health endpoint...")
-    response = requests.get(f"{BASE_URL}/health")
+    response = client.get("/health")
     assert response.status_code == 200
     assert response.json()["status"] == "healthy"
     print("   ✓ Health check passed")
@@ -29,12 +56,12 @@ def test_create_employee():
         "email": "john.doe@test.com",
         "department": "Engineering"
     }
-    response = requests.post(f"{BASE_URL}/api/employees", json=employee_data)
+    response = client.post("/api/employees", json=employee_data)
     
     if response.status_code == 400:
         # Employee might already exist, try to delete and recreate
-        requests.delete(f"{BASE_URL}/api/employees/TEST001")
-        response = requests.post(f"{BASE_URL}/api/employees", json=employee_data)
+        client.delete("/api/employees/TEST001")
+        response = client.post("/api/employees", json=employee_data)
     
     assert response.status_code == 201, f"Expected 201, got {response.status_code}: {response.text}"
     data = response.json()
@@ -46,7 +73,7 @@ def test_create_employee():
 def test_get_employees():
     """Test getting all employees."""
     print("\n3. Testing get all employees...")
-    response = requests.get(f"{BASE_URL}/api/employees")
+    response = client.get("/api/employees")
     assert response.status_code == 200
     data = response.json()
     assert isinstance(data, list)
@@ -56,30 +83,132 @@ def test_get_employees():
 def test_get_employee():
     """Test getting a specific employee."""
     print("\n4. Testing get employee by ID...")
-    response = requests.get(f"{BASE_URL}/api/employees/TEST001")
+    response = client.get("/api/employees/TEST001")
     assert response.status_code == 200
     data = response.json()
     assert data["employee_id"] == "TEST001"
     print("   ✓ Get employee passed")
 
+def test_response_compression():
+    """Test encoding negotiation, ETag revalidation and cache invalidation."""
+    print("\n5. Testing response compression...")
+    # The OpenAPI schema is large enough to be compressed
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    schema = response.json()
+    
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.json() == schema
+    
+    # zstd and br are optional; when the server has them they win over gzip
+    for encoding in ("zstd", "br"):
+        response = client.get("/openapi.json", headers={"Accept-Encoding": f"gzip, {encoding}"})
+        assert response.headers["content-encoding"] in (encoding, "gzip")
+    if not isinstance(client, LiveClient):
+        from app.middleware.compression import brotli, zstandard
+        response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip, br, zstd"})
+        expected = "zstd" if zstandard else "br" if brotli else "gzip"
+        assert response.headers["content-encoding"] == expected
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "zstd;q=0, br;q=0, gzip;q=0.5"})
+    assert response.headers["content-encoding"] == "gzip"
+    
+    # Large bodies are compressed off the event loop
+    if not isinstance(client, LiveClient):
+        import asyncio
+        import gzip
+        from app.config import Settings
+        from app.middleware import CompressionMiddleware
+        
+        async def compress_large_body():
+            middleware = CompressionMiddleware(None, Settings())
+            body = b"".join(b'{"employee_id": "EMP%05d", "status": "Present"},' % i for i in range(50000))
+            ticks = 0
+            
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0)
+            
+            task = asyncio.create_task(ticker())
+            await asyncio.sleep(0)
+            ticks = 0
+            compressed, encoding = await middleware.encode(body, "gzip")
+            task.cancel()
+            assert encoding == "gzip" and gzip.decompress(compressed) == body
+            return ticks
+        
+        assert asyncio.run(compress_large_body()) > 1
+    
+    # Cached responses revalidate with their ETag until the next write
+    response = client.get("/api/employees")
+    etag = response.headers["etag"]
+    response = client.get("/api/employees", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    
+    response = client.post("/api/employees", json={
+        "employee_id": "TESTCACHE",
+        "full_name": "Cache Test",
+        "email": "cache.test@test.com",
+        "department": "QA",
+    })
+    assert response.status_code == 201
+    response = client.get("/api/employees", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert any(e["employee_id"] == "TESTCACHE" for e in response.json())
+    
+    assert client.delete("/api/employees/TESTCACHE").status_code == 204
+    response = client.get("/api/employees")
+    assert all(e["employee_id"] != "TESTCACHE" for e in response.json())
+    print("   ✓ Response compression passed")
+
+def test_batch_get_employees():
+    """Test looking up several employees at once."""
+    print("\n6. Testing batch get employees...")
+    response = client.post("/api/employees/batch-get", json={"employee_ids": ["TEST001", "NONEXISTENT", "TEST001"]})
+    assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
+    data = response.json()
+    assert list(data["employees"]) == ["TEST001"]
+    assert data["employees"]["TEST001"]["full_name"] == "John Doe"
+    assert data["missing"] == ["NONEXISTENT"]
+    
+    # A batch lookup never reads the whole employee collection into the directory
+    loads = directory_loads()
+    response = client.post("/api/employees/batch-get", json={"employee_ids": ["TEST001"]})
+    assert list(response.json()["employees"]) == ["TEST001"]
+    assert directory_loads() == loads
+    print("   ✓ Batch get employees passed")
+
 def test_mark_attendance():
     """Test marking attendance."""
-    print("\n5. Testing mark attendance...")
+    print("\n7. Testing mark attendance...")
     attendance_data = {
         "employee_id": "TEST001",
         "date": date.today().isoformat(),
         "status": "Present"
     }
-    response = requests.post(f"{BASE_URL}/api/attendance", json=attendance_data)
+    response = client.post("/api/attendance", json=attendance_data)
     assert response.status_code == 201, f"Expected 201, got {response.status_code}: {response.text}"
     data = response.json()
     assert data["status"] == "Present"
+    
+    # Attendance writes leave the cached employee directory in place
+    client.get("/api/employees")
+    loads = directory_loads()
+    response = client.post("/api/attendance", json=attendance_data)
+    assert response.status_code == 201
+    client.get("/api/employees")
+    assert directory_loads() == loads
     print("   ✓ Mark attendance passed")
 
 def test_get_attendance():
     """Test getting attendance records."""
-    print("\n6. Testing get attendance records...")
-    response = requests.get(f"{BASE_URL}/api/attendance")
+    print("\n8. Testing get attendance records...")
+    response = client.get("/api/attendance")
     assert response.status_code == 200
     data = response.json()
     assert isinstance(data, list)
@@ -87,43 +216,469 @@ def test_get_attendance():
 
 def test_get_employee_attendance():
     """Test getting attendance for specific employee."""
-    print("\n7. Testing get employee attendance...")
-    response = requests.get(f"{BASE_URL}/api/attendance/employee/TEST001")
+    print("\n9. Testing get employee attendance...")
+    response = client.get("/api/attendance/employee/TEST001")
     assert response.status_code == 200
     data = response.json()
     assert isinstance(data, list)
     assert len(data) >= 1
     print(f"   ✓ Get employee attendance passed ({len(data)} records)")
 
+def test_employee_attendance_calendar():
+    """Test compact attendance calendar for an employee."""
+    print("\n10. Testing employee attendance calendar...")
+    today = date.today().isoformat()
+    response = client.get(f"/api/attendance/employee/TEST001/calendar?from={today}&to={today}")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["days"] == "P"
+    assert data["total_present"] == 1
+    assert data["current_streak"] == {"status": "Present", "days": 1}
+    print("   ✓ Employee attendance calendar passed")
+
+def test_sync():
+    """Test delta sync."""
+    print("\n11. Testing delta sync...")
+    response = client.get("/api/sync")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["full"] is True
+    assert any(e["employee_id"] == "TEST001" for e in data["employees"])
+    
+    token = data["token"]
+    response = client.get("/api/sync", params={"since": token})
+    assert response.status_code == 200
+    assert response.json()["full"] is False
+    
+    # Tokens trail the clock by a safety window, so writes made after taking
+    # one are always in the next delta
+    response = client.post("/api/employees", json={
+        "employee_id": "SYNC001",
+        "full_name": "Sid Sync",
+        "email": "sid.sync@test.com",
+        "department": "Operations",
+    })
+    assert response.status_code == 201
+    response = client.post("/api/attendance", json={
+        "employee_id": "SYNC001", "date": date.today().isoformat(), "status": "Absent",
+    })
+    assert response.status_code == 201
+    
+    data = client.get("/api/sync", params={"since": token}).json()
+    assert data["full"] is False
+    assert any(e["employee_id"] == "SYNC001" for e in data["employees"])
+    assert any(a["employee_id"] == "SYNC001" and a["status"] == "Absent" for a in data["attendance"])
+    assert "SYNC001" not in data["deleted_employees"]
+    
+    assert client.delete("/api/employees/SYNC001").status_code == 204
+    data = client.get("/api/sync", params={"since": token}).json()
+    assert "SYNC001" in data["deleted_employees"]
+    assert all(e["employee_id"] != "SYNC001" for e in data["employees"])
+    
+    response = client.get("/api/sync", params={"since": "not-a-token"})
+    assert response.status_code == 400
+    print("   ✓ Delta sync passed")
+
 def test_attendance_summary():
     """Test attendance summary."""
-    print("\n8. Testing attendance summary...")
-    response = requests.get(f"{BASE_URL}/api/attendance/summary")
+    print("\n12. Testing attendance summary...")
+    response = client.get("/api/attendance/summary")
     assert response.status_code == 200
     data = response.json()
     assert isinstance(data, list)
     print(f"   ✓ Attendance summary passed ({len(data)} employees)")
 
+def test_close_day():
+    """Test the end-of-day close: only employees hired by the day, idempotent."""
+    print("\n13. Testing close day...")
+    # Nobody was employed this long ago, so there is nobody to mark
+    response = client.post("/api/attendance/close-day", params={"date": "2000-01-03"})
+    assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
+    assert response.json()["unmarked"] == 0
+    
+    response = client.post("/api/employees", json={
+        "employee_id": "CLOSE001",
+        "full_name": "Carla Close",
+        "email": "carla.close@test.com",
+        "department": "Engineering",
+    })
+    assert response.status_code == 201
+    
+    response = client.post("/api/attendance/close-day")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["inserted"] >= 1 and data["skipped"] == 0
+    records = client.get("/api/attendance/employee/CLOSE001").json()
+    assert [r["status"] for r in records] == ["Absent"]
+    records = client.get("/api/attendance/employee/TEST001").json()
+    assert any(r["date"] == date.today().isoformat() and r["status"] == "Present" for r in records)
+    
+    # Running again finds nothing left to close
+    response = client.post("/api/attendance/close-day")
+    assert response.status_code == 200
+    assert response.json()["unmarked"] == 0 and response.json()["inserted"] == 0
+    
+    response = client.post("/api/attendance/close-day", params={"date": "2999-01-01"})
+    assert response.status_code == 400
+    
+    assert client.delete("/api/employees/CLOSE001").status_code == 204
+    print("   ✓ Close day passed")
+
+def test_attendance_analytics():
+    """Test attendance analytics."""
+    print("\n14. Testing attendance analytics...")
+    today = date.today().isoformat()
+    response = client.get(f"/api/analytics/departments?from={today}&to={today}")
+    assert response.status_code == 200
+    departments = {d["department"]: d for d in response.json()["departments"]}
+    assert departments["Engineering"]["present_days"] >= 1
+    
+    response = client.get("/api/analytics/rolling?window=7")
+    assert response.status_code == 200
+    assert len(response.json()["rates"]) == 90
+    
+    response = client.get("/api/analytics/weekdays")
+    assert response.status_code == 200
+    assert len(response.json()["weekdays"]) == 7
+    
+    response = client.get("/api/analytics/absentees")
+    assert response.status_code == 200
+    assert all(a["employee_id"] != "TEST001" for a in response.json()["absentees"])
+    
+    # Marking attendance updates the cached matrix instead of rebuilding it
+    def matrix_builds():
+        series = client.get("/metrics").json()["counters"]["analytics_matrix_cache_total"]
+        return sum(s["value"] for s in series if s["labels"] == {"result": "miss", "tenant": "default"})
+    
+    def engineering_present_days():
+        response = client.get("/api/analytics/departments")
+        return next(d for d in response.json()["departments"] if d["department"] == "Engineering")["present_days"]
+    
+    present_days = engineering_present_days()
+    builds = matrix_builds()
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+    response = client.post("/api/attendance", json={"employee_id": "TEST001", "date": yesterday, "status": "Present"})
+    assert response.status_code == 201
+    assert engineering_present_days() == present_days + 1
+    assert matrix_builds() == builds
+
+    # So does adding and removing employees
+    def research_headcount():
+        response = client.get("/api/analytics/departments")
+        return next((d["employees"] for d in response.json()["departments"] if d["department"] == "Research"), 0)
+
+    response = client.post("/api/employees", json={
+        "employee_id": "TEST000",
+        "full_name": "Ada Research",
+        "email": "ada.research@test.com",
+        "department": "Research",
+    })
+    assert response.status_code == 201
+    assert research_headcount() == 1
+    assert client.delete("/api/employees/TEST000").status_code == 204
+    assert research_headcount() == 0
+    assert engineering_present_days() == present_days + 1
+    assert matrix_builds() == builds
+
+    if not isinstance(client, LiveClient):
+        import asyncio
+        from app.analytics import ABSENT, get_matrix, matrix_cache, record_attendance
+        from app.tenancy import tenant_context
+
+        # A write made while a matrix is building is applied once the build is done
+        start_date = date.today() - timedelta(days=3)
+        two_days_ago = (date.today() - timedelta(days=2)).isoformat()
+
+        async def write_during_build():
+            with tenant_context("default"):
+                building = asyncio.create_task(get_matrix(start_date, date.today()))
+                await asyncio.sleep(0)
+                assert not building.done()
+                record_attendance([("TEST001", two_days_ago, "Absent")])
+                matrix = await building
+                assert matrix.statuses[matrix.row_of["TEST001"], 1] == ABSENT
+                assert matrix_cache.peek((start_date, date.today())) is matrix
+
+        builds = matrix_builds()
+        asyncio.run(write_during_build())
+        assert matrix_builds() == builds + 1
+    print("   ✓ Attendance analytics passed")
+
+def test_tenant_isolation():
+    """Test that tenants do not see each other's data."""
+    print("\n15. Testing tenant isolation...")
+    response = client.get("/api/employees", headers={"X-Tenant-ID": "no-such-tenant"})
+    assert response.status_code == 404
+    
+    response = client.get("/api/employees", headers={"X-Tenant-ID": "acme"})
+    if response.status_code == 404:
+        print("   - Skipped: tenant 'acme' is not configured (set TENANTS='[\"acme\"]')")
+        return
+    assert response.status_code == 200
+    assert all(e["employee_id"] != "TEST001" for e in response.json())
+    
+    response = client.get("/api/attendance/employee/TEST001", headers={"X-Tenant-ID": "acme"})
+    assert response.status_code == 404
+    
+    # Metrics only show the caller's tenant, unless the admin token is sent
+    def metric_tenants(headers):
+        snapshot = client.get("/metrics", headers=headers).json()
+        return {
+            s["labels"]["tenant"]
+            for kind in ("counters", "gauges")
+            for series in snapshot[kind].values()
+            for s in series
+            if "tenant" in s["labels"]
+        }
+    
+    assert metric_tenants({"X-Tenant-ID": "acme"}) == {"acme"}
+    admin_token = os.environ.get("ADMIN_TOKEN")
+    if admin_token:
+        assert {"acme", "default"} <= metric_tenants({"X-Tenant-ID": "acme", "X-Admin-Token": admin_token})
+    print("   ✓ Tenant isolation passed")
+
+def test_attendance_archival():
+    """Test moving old attendance to the archive tier, including an interrupted move."""
+    print("\n16. Testing attendance archival...")
+    if isinstance(client, LiveClient):
+        print("   - Skipped: needs --in-process")
+        return
+    
+    import asyncio
+    from app.archival import archive_attendance
+    from app.cache import bump_data_version
+    from app.repositories import get_attendance_repository
+    from app.tenancy import tenant_context
+    
+    # Runs in its own tenant so the archive watermark does not affect other tests
+    headers = {"X-Tenant-ID": "acme"}
+    response = client.post("/api/employees", headers=headers, json={
+        "employee_id": "ARCH001",
+        "full_name": "Archie Ved",
+        "email": "archie@test.com",
+        "department": "Records",
+    })
+    if response.status_code == 404:
+        print("   - Skipped: tenant 'acme' is not configured")
+        return
+    assert response.status_code == 201
+    old_days = [(date.today() - timedelta(days=days)).isoformat() for days in (400, 420, 440)]
+    for day in old_days[:2]:
+        response = client.post("/api/attendance", headers=headers, json={
+            "employee_id": "ARCH001", "date": day, "status": "Present",
+        })
+        assert response.status_code == 201
+    
+    def summary_days():
+        response = client.get("/api/attendance/summary", headers=headers)
+        return next(s["total_days"] for s in response.json() if s["employee_id"] == "ARCH001")
+    
+    def record_count():
+        return len(client.get("/api/attendance/employee/ARCH001", headers=headers).json())
+    
+    async def archive():
+        with tenant_context("acme"):
+            return await archive_attendance(12, batch_size=1)
+    
+    report = asyncio.run(archive())
+    assert report["moved"] == 2 and report["batches"] == 2
+    assert record_count() == 2
+    assert summary_days() == 2
+    
+    # A run interrupted between copying a batch and deleting it from the hot
+    # tier leaves the record in both; reads must still count it once
+    response = client.post("/api/attendance", headers=headers, json={
+        "employee_id": "ARCH001", "date": old_days[2], "status": "Absent",
+    })
+    assert response.status_code == 201
+    
+    async def copy_without_delete():
+        with tenant_context("acme"):
+            repository = get_attendance_repository()
+            records = await repository.hot.find_before(date.today(), 10)
+            await repository.archive.replace_many(records)
+            repository.advance_watermark(date.fromisoformat(records[-1]["date"]))
+            bump_data_version()
+            return await repository.count_by_status(date.fromisoformat(old_days[2]))
+    
+    assert asyncio.run(copy_without_delete()) == {"Absent": 1}
+    assert record_count() == 3
+    assert summary_days() == 3
+    
+    # The next run finishes the move
+    assert asyncio.run(archive())["moved"] == 1
+    assert record_count() == 3
+    assert summary_days() == 3
+    
+    assert client.delete("/api/employees/ARCH001", headers=headers).status_code == 204
+    print("   ✓ Attendance archival passed")
+
 def test_dashboard_stats():
     """Test dashboard stats."""
-    print("\n9. Testing dashboard stats...")
-    response = requests.get(f"{BASE_URL}/api/dashboard/stats")
+    print("\n17. Testing dashboard stats...")
+    response = client.get("/api/dashboard/stats")
     assert response.status_code == 200
     data = response.json()
     assert "total_employees" in data
     assert "present_today" in data
     print(f"   ✓ Dashboard stats passed (Total: {data['total_employees']}, Present: {data['present_today']})")
 
+def test_page_bootstrap():
+    """Test combined page bootstrap payloads."""
+    print("\n18. Testing page bootstrap...")
+    response = client.get("/api/bootstrap/dashboard")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["employees"]["TEST001"] == "John Doe"
+    assert data["today"]["TEST001"] == "Present"
+    assert data["stats"]["present_today"] >= 1
+    assert any(s["employee_id"] == "TEST001" for s in data["summary"])
+    
+    today = date.today().isoformat()
+    response = client.get(f"/api/bootstrap/attendance?start_date={today}&end_date={today}")
+    assert response.status_code == 200
+    data = response.json()
+    assert any(a["employee_id"] == "TEST001" and a["employee_name"] == "John Doe" for a in data["attendance"])
+    assert data["summary"] is None
+    
+    response = client.get("/api/bootstrap/unknown")
+    assert response.status_code == 422
+    print("   ✓ Page bootstrap passed")
+
+def test_request_profiling():
+    """Test opt-in request profiling through the admin API."""
+    print("\n19. Testing request profiling...")
+    admin_token = os.environ.get("ADMIN_TOKEN", "")
+    headers = {"X-Admin-Token": admin_token}
+    response = client.get("/api/admin/profiles", headers=headers)
+    if response.status_code == 404:
+        print("   - Skipped: admin API is disabled (set ADMIN_TOKEN)")
+        return
+    assert response.status_code == 200
+    
+    response = client.get("/api/admin/profiles", headers={"X-Admin-Token": "wrong"})
+    assert response.status_code == 401
+
+    # Non-ASCII tokens are rejected like any other wrong token
+    non_ascii = {"X-Admin-Token": "\xe9t".encode("latin-1")}
+    assert client.get("/api/admin/profiles", headers=non_ascii).status_code == 401
+    response = client.get("/metrics", headers=non_ascii)
+    assert response.status_code == 200
+    assert all(
+        series["labels"].get("tenant", "default") == "default"
+        for counter in response.json()["counters"].values()
+        for series in counter
+    )
+
+    # The toggle reports what it is actually set to
+    toggle = {"enabled": False, "sample_rate": 0.25, "path_prefix": "/api/analytics"}
+    response = client.put("/api/admin/profiling", headers=headers, json=toggle)
+    assert response.status_code == 200
+    assert client.get("/api/admin/profiling", headers=headers).json() == toggle
+    response = client.put("/api/admin/profiling", headers=headers, json={**toggle, "sample_rate": 0})
+    assert response.status_code == 422
+    
+    # Without the admin token the profiling header is ignored
+    response = client.get("/api/employees", headers={"X-Profile": "1"})
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+    
+    response = client.get("/api/bootstrap/dashboard", headers={"X-Profile": "1", **headers})
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+    
+    response = client.get(f"/api/admin/profiles/{profile_id}", headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["path"] == "/api/bootstrap/dashboard"
+    assert data["status_code"] == 200
+    assert set(data["breakdown_ms"]) == {"cpu", "await_mongo", "await_other", "runnable"}
+    
+    response = client.get(f"/api/admin/profiles/{profile_id}/collapsed", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert all(line.startswith("GET /api/bootstrap/dashboard;") for line in response.text.splitlines())
+    print("   ✓ Request profiling passed")
+
+def test_live_events():
+    """Test live event fan-out: dashboard deltas, slow clients and heartbeats."""
+    print("\n20. Testing live events...")
+    response = client.get("/api/events", headers={"X-Tenant-ID": "no-such-tenant"})
+    assert response.status_code == 404
+    if isinstance(client, LiveClient):
+        print("   - Skipped: needs --in-process")
+        return
+    
+    import asyncio
+    import json
+    from app.events import EventBroker, event_stream, get_broker
+    
+    response = client.post("/api/employees", json={
+        "employee_id": "EVT001",
+        "full_name": "Eve Events",
+        "email": "eve.events@test.com",
+        "department": "Support",
+    })
+    assert response.status_code == 201
+    
+    # Marking today moves the counters; re-marking moves them back and over
+    broker = get_broker()
+    subscriber = broker.subscribe()
+    
+    def dashboard_deltas():
+        deltas = []
+        while not subscriber.queue.empty():
+            event, data = subscriber.queue.get_nowait().strip().split("\n")
+            if event == "event: dashboard":
+                delta = json.loads(data[len("data: "):])
+                assert delta.pop("date") == date.today().isoformat()
+                deltas.append(delta)
+        return deltas
+    
+    try:
+        for status_value in ("Present", "Absent"):
+            response = client.post("/api/attendance", json={
+                "employee_id": "EVT001", "date": date.today().isoformat(), "status": status_value,
+            })
+            assert response.status_code == 201
+        assert dashboard_deltas() == [{"present_today": 1}, {"present_today": -1, "absent_today": 1}]
+    finally:
+        broker.unsubscribe(subscriber)
+    assert client.delete("/api/employees/EVT001").status_code == 204
+    
+    async def check_streams():
+        broker = EventBroker("events-test", buffer_size=3)
+        
+        # A subscriber that never reads is dropped once its buffer overflows,
+        # and its stream ends instead of sending a partial history
+        slow = broker.subscribe()
+        for number in range(broker.buffer_size + 1):
+            broker.publish("attendance", {"number": number})
+        assert slow not in broker.subscribers
+        messages = [message async for message in event_stream(slow, heartbeat_seconds=5)]
+        assert messages == ["retry: 3000\n\n"]
+        
+        # An idle stream gets heartbeat comments
+        idle = broker.subscribe()
+        stream = event_stream(idle, heartbeat_seconds=0.01)
+        assert await stream.__anext__() == "retry: 3000\n\n"
+        assert await stream.__anext__() == ": heartbeat\n\n"
+        await stream.aclose()
+        assert not broker.subscribers
+    
+    asyncio.run(check_streams())
+    print("   ✓ Live events passed")
+
 def test_delete_employee():
     """Test deleting an employee."""
-    print("\n10. Testing delete employee...")
-    response = requests.delete(f"{BASE_URL}/api/employees/TEST001")
+    print("\n21. Testing delete employee...")
+    response = client.delete("/api/employees/TEST001")
     assert response.status_code == 204
     print("   ✓ Delete employee passed")
 
 def test_validation_errors():
     """Test validation error handling."""
-    print("\n11. Testing validation errors...")
+    print("\n22. Testing validation errors...")
     
     # Test invalid email
     invalid_data = {
@@ -132,50 +687,157 @@ def test_validation_errors():
         "email": "invalid-email",
         "department": "Test"
     }
-    response = requests.post(f"{BASE_URL}/api/employees", json=invalid_data)
+    response = client.post("/api/employees", json=invalid_data)
     assert response.status_code == 422, f"Expected 422 for invalid email, got {response.status_code}"
     print("   ✓ Invalid email validation passed")
     
     # Test missing fields
     incomplete_data = {"employee_id": "TEST002"}
-    response = requests.post(f"{BASE_URL}/api/employees", json=incomplete_data)
+    response = client.post("/api/employees", json=incomplete_data)
     assert response.status_code == 422, f"Expected 422 for missing fields, got {response.status_code}"
     print("   ✓ Missing fields validation passed")
 
 def test_not_found():
     """Test 404 handling."""
-    print("\n12. Testing not found handling...")
-    response = requests.get(f"{BASE_URL}/api/employees/NONEXISTENT")
+    print("\n23. Testing not found handling...")
+    response = client.get("/api/employees/NONEXISTENT")
     assert response.status_code == 404
     print("   ✓ Not found handling passed")
 
+def test_admission_control():
+    """Test load shedding: queue full, queue timeout, handoff and metrics."""
+    print("\n24. Testing admission control...")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    admitted = response.json()["counters"]["admission_admitted_total"]
+    assert any(series["labels"]["route_class"] == "read" for series in admitted)
+    
+    if isinstance(client, LiveClient):
+        print("   - Skipped queueing checks: needs --in-process")
+        print("   ✓ Admission metrics passed")
+        return
+    
+    import asyncio
+    from app.config import Settings
+    from app.middleware import AdmissionControlMiddleware
+    
+    async def run_checks():
+        release = asyncio.Event()
+        
+        async def slow_app(scope, receive, send):
+            await release.wait()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+        
+        middleware = AdmissionControlMiddleware(slow_app, Settings(
+            admission_heavy_concurrency=1,
+            admission_heavy_queue=1,
+            admission_queue_timeout=0.2,
+            admission_retry_after=3,
+        ))
+        
+        async def request():
+            messages = []
+            async def send(message):
+                messages.append(message)
+            scope = {"type": "http", "method": "GET", "path": "/api/analytics/departments"}
+            await middleware(scope, None, send)
+            start = messages[0]
+            return start["status"], dict(start["headers"])
+        
+        # One running, one queued: the third is rejected straight away
+        running = asyncio.create_task(request())
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(request())
+        await asyncio.sleep(0)
+        status_code, headers = await request()
+        assert status_code == 503
+        assert headers[b"retry-after"] == b"3"
+        
+        # The queued request gets the running one's slot when it finishes
+        release.set()
+        assert (await running)[0] == 200
+        assert (await queued)[0] == 200
+        assert middleware.limiters["heavy"].in_flight == 0
+        
+        # A cancelled waiter leaves the queue, and a waiter that is never
+        # admitted times out with 503
+        release.clear()
+        running = asyncio.create_task(request())
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(request())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        assert not middleware.limiters["heavy"].waiters
+        assert (await request())[0] == 503
+        release.set()
+        assert (await running)[0] == 200
+        assert middleware.limiters["heavy"].in_flight == 0
+    
+    asyncio.run(run_checks())
+    
+    rejected = client.get("/metrics").json()["counters"]["admission_rejected_total"]
+    reasons = {series["labels"]["reason"] for series in rejected if series["labels"]["route_class"] == "heavy"}
+    assert reasons == {"queue_full", "queue_timeout"}
+    print("   ✓ Admission control passed")
+
+def use_in_process_client():
+    """Run the app in-process on the memory storage backend."""
+    global client
+    os.environ["STORAGE_BACKEND"] = "memory"
+    os.environ.setdefault("TENANTS", '["acme"]')
+    os.environ.setdefault("ADMIN_TOKEN", "test-admin-token")
+    from fastapi.testclient import TestClient
+    from app.main import app
+    
+    client = TestClient(app)
+    client.__enter__()
+
+
 def main():
+    if "--in-process" in sys.argv:
+        use_in_process_client()
+    
     print("=" * 50)
     print("HRMS Lite API Integration Tests")
     print("=" * 50)
     
     try:
         # Check if server is running
-        try:
-            requests.get(f"{BASE_URL}/health", timeout=5)
-        except requests.exceptions.ConnectionError:
-            print("\n❌ Error: Backend server is not running!")
-            print("   Start the server with: uvicorn app.main:app --reload")
-            sys.exit(1)
+        if isinstance(client, LiveClient):
+            try:
+                client.get("/health", timeout=5)
+            except requests.exceptions.ConnectionError:
+                print("\n❌ Error: Backend server is not running!")
+                print("   Start the server with: uvicorn app.main:app --reload")
+                sys.exit(1)
         
         # Run tests
         test_health()
         test_create_employee()
         test_get_employees()
         test_get_employee()
+        test_response_compression()
+        test_batch_get_employees()
         test_mark_attendance()
         test_get_attendance()
         test_get_employee_attendance()
+        test_employee_attendance_calendar()
+        test_sync()
         test_attendance_summary()
+        test_close_day()
+        test_attendance_analytics()
+        test_tenant_isolation()
+        test_attendance_archival()
         test_dashboard_stats()
+        test_page_bootstrap()
+        test_request_profiling()
+        test_live_events()
         test_delete_employee()
         test_validation_errors()
         test_not_found()
+        test_admission_control()
         
         print("\n" + "=" * 50)
         print("✅ All tests passed!")
@@ -1,5 +1,5 @@
 import apiClient from './client';
-import type { Attendance, AttendanceCreate, AttendanceSummary } from '../types';
+import type { Attendance, AttendanceCalendar, AttendanceCreate, AttendanceSummary } from '../types';
 
 const ATTENDANCE_ENDPOINT = '/api/attendance';
 
@@ -42,6 +42,27 @@ export const getEmployeeAttendance = async (
   return response.data;
 };
 
+/**
+ * Get the compact attendance calendar for an employee (defaults to the last year)
+ */
+export const getEmployeeAttendanceCalendar = async (
+  employeeId: string,
+  from?: string,
+  to?: string
+): Promise<AttendanceCalendar> => {
+  const params = new URLSearchParams();
+  if (from) params.append('from', from);
+  if (to) params.append('to', to);
+  
+  const queryString = params.toString();
+  const url = queryString
+    ? `${ATTENDANCE_ENDPOINT}/employee/${employeeId}/calendar?${queryString}`
+    : `${ATTENDANCE_ENDPOINT}/employee/${employeeId}/calendar`;
+  
+  const response = await apiClient.get<AttendanceCalendar>(url);
+  return response.data;
+};
+
 /**
  * Mark attendance for an employee
  */
@@ -0,0 +1,33 @@
+import apiClient from './client';
+import type { AttendanceBootstrap, DashboardBootstrap } from '../types';
+
+const BOOTSTRAP_ENDPOINT = '/api/bootstrap';
+
+/**
+ * Get everything the dashboard needs on first load in one request
+ */
+export const getDashboardBootstrap = async (): Promise<DashboardBootstrap> => {
+  const response = await apiClient.get<DashboardBootstrap>(`${BOOTSTRAP_ENDPOINT}/dashboard`);
+  return response.data;
+};
+
+/**
+ * Get everything the attendance page needs on first load in one request,
+ * with attendance records optionally filtered by date
+ */
+export const getAttendanceBootstrap = async (
+  startDate?: string,
+  endDate?: string
+): Promise<AttendanceBootstrap> => {
+  const params = new URLSearchParams();
+  if (startDate) params.append('start_date', startDate);
+  if (endDate) params.append('end_date', endDate);
+  
+  const queryString = params.toString();
+  const url = queryString
+    ? `${BOOTSTRAP_ENDPOINT}/attendance?${queryString}`
+    : `${BOOTSTRAP_ENDPOINT}/attendance`;
+  
+  const response = await apiClient.get<AttendanceBootstrap>(url);
+  return response.data;
+};
@@ -1,7 +1,9 @@
 import axios from 'axios';
 
 // API Base URL - configurable via environment variable
-const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+export const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+// Tenant to act as on a multi-tenant backend (unset: the default tenant or the subdomain's)
+export const TENANT_ID: string | undefined = import.meta.env.VITE_TENANT_ID || undefined;
 const IS_DEV = import.meta.env.DEV;
 
 // Create axios instance with default configuration
@@ -9,6 +11,7 @@ const apiClient = axios.create({
   baseURL: API_BASE_URL,
   headers: {
     'Content-Type': 'application/json',
+    ...(TENANT_ID ? { 'X-Tenant-ID': TENANT_ID } : {}),
   },
   timeout: 15000, // 15 seconds timeout
 });
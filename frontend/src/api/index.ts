@@ -1,5 +1,7 @@
 export * from './employees';
 export * from './attendance';
-export { default as apiClient } from './client';
+export * from './sync';
+export * from './bootstrap';
+export { default as apiClient, API_BASE_URL, TENANT_ID } from './client';
 
 
@@ -0,0 +1,15 @@
+import apiClient from './client';
+import type { SyncResponse } from '../types';
+
+const SYNC_ENDPOINT = '/api/sync';
+
+/**
+ * Get employees and attendance changed since the previous sync token.
+ * Without a token (or with an expired one) a full snapshot is returned.
+ */
+export const syncChanges = async (since?: string): Promise<SyncResponse> => {
+  const response = await apiClient.get<SyncResponse>(SYNC_ENDPOINT, {
+    params: since ? { since } : undefined,
+  });
+  return response.data;
+};
@@ -1,12 +1,12 @@
 import { useEffect, useState } from 'react';
 import { CalendarCheck, Plus, Filter, UserCheck, UserX } from 'lucide-react';
 import { Button, Card, Input, Select, Modal, EmptyState, LoadingSpinner, ErrorState, Badge } from '../components/ui';
-import { getAllAttendance, markAttendance, getAllEmployees } from '../api';
-import type { Attendance, AttendanceCreate, Employee } from '../types';
+import { getAllAttendance, markAttendance, getAttendanceBootstrap } from '../api';
+import type { Attendance, AttendanceCreate } from '../types';
 
 export default function AttendancePage() {
   const [attendance, setAttendance] = useState<Attendance[]>([]);
-  const [employees, setEmployees] = useState<Employee[]>([]);
+  const [employeeNames, setEmployeeNames] = useState<Record<string, string>>({});
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   
@@ -33,13 +33,11 @@ export default function AttendancePage() {
       setLoading(true);
       setError(null);
       
-      const [attendanceData, employeesData] = await Promise.all([
-        getAllAttendance(startDate || undefined, endDate || undefined),
-        getAllEmployees(),
-      ]);
+      // Records and the employee name map in one round trip
+      const data = await getAttendanceBootstrap(startDate || undefined, endDate || undefined);
       
-      setAttendance(attendanceData);
-      setEmployees(employeesData);
+      setAttendance(data.attendance);
+      setEmployeeNames(data.employees);
     } catch (err) {
       setError('Failed to load attendance data. Please check if the server is running.');
       console.error('Fetch attendance error:', err);
@@ -118,6 +116,8 @@ export default function AttendancePage() {
     }
   };
 
+  const employees = Object.entries(employeeNames);
+
   const filteredAttendance = filterEmployee 
     ? attendance.filter(a => a.employee_id === filterEmployee)
     : attendance;
@@ -184,7 +184,7 @@ export default function AttendancePage() {
               onChange={(e) => setFilterEmployee(e.target.value)}
               options={[
                 { value: '', label: 'All Employees' },
-                ...employees.map(emp => ({ value: emp.employee_id, label: emp.full_name }))
+                ...employees.map(([employeeId, name]) => ({ value: employeeId, label: name }))
               ]}
             />
           </div>
@@ -309,7 +309,7 @@ export default function AttendancePage() {
             onChange={(e) => setFormData({ ...formData, employee_id: e.target.value })}
             options={[
               { value: '', label: 'Select an employee' },
-              ...employees.map(emp => ({ value: emp.employee_id, label: `${emp.full_name} (${emp.employee_id})` }))
+              ...employees.map(([employeeId, name]) => ({ value: employeeId, label: `${name} (${employeeId})` }))
             ]}
             error={formErrors.employee_id}
           />
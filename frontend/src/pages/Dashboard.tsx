@@ -1,16 +1,8 @@
-import { useEffect, useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import { Users, UserCheck, UserX, TrendingUp, CalendarDays } from 'lucide-react';
 import { Card, LoadingSpinner, ErrorState } from '../components/ui';
-import { apiClient } from '../api';
-import type { AttendanceSummary } from '../types';
-
-interface DashboardStats {
-  total_employees: number;
-  present_today: number;
-  absent_today: number;
-  attendance_rate: number;
-  date: string;
-}
+import { getDashboardBootstrap, API_BASE_URL, TENANT_ID } from '../api';
+import type { AttendanceSummary, BootstrapStats as DashboardStats, DashboardBootstrap } from '../types';
 
 export default function Dashboard() {
   const [stats, setStats] = useState<DashboardStats | null>(null);
@@ -18,22 +10,31 @@ export default function Dashboard() {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
-  const fetchData = async () => {
+  // Live deltas are relative to the last snapshot, so any that arrive while a
+  // snapshot is loading (or while disconnected) mean it must be fetched again
+  const fetching = useRef(false);
+  const missedDeltas = useRef(false);
+
+  const fetchData = async (background = false) => {
     try {
-      setLoading(true);
+      if (!background) setLoading(true);
       setError(null);
+      fetching.current = true;
       
-      const [statsResponse, summaryResponse] = await Promise.all([
-        apiClient.get<DashboardStats>('/api/dashboard/stats'),
-        apiClient.get<AttendanceSummary[]>('/api/attendance/summary'),
-      ]);
+      // Stats and summary in one round trip, again if deltas arrived meanwhile
+      let data: DashboardBootstrap;
+      do {
+        missedDeltas.current = false;
+        data = await getDashboardBootstrap();
+      } while (missedDeltas.current);
       
-      setStats(statsResponse.data);
-      setSummaries(summaryResponse.data);
+      setStats(data.stats);
+      setSummaries(data.summary);
     } catch (err) {
       setError('Failed to load dashboard data. Please check if the server is running.');
       console.error('Dashboard error:', err);
     } finally {
+      fetching.current = false;
       setLoading(false);
     }
   };
@@ -42,6 +43,47 @@ export default function Dashboard() {
     fetchData();
   }, []);
 
+  // Live counter updates pushed by the server instead of polling
+  useEffect(() => {
+    // EventSource cannot send headers, so the tenant goes in the query string
+    const query = TENANT_ID ? `?tenant=${encodeURIComponent(TENANT_ID)}` : '';
+    const events = new EventSource(`${API_BASE_URL}/api/events${query}`);
+
+    // The server drops slow clients and the browser reconnects on its own;
+    // deltas sent in between are lost, so resync on every reconnect
+    let connected = false;
+    events.addEventListener('open', () => {
+      if (connected) {
+        if (fetching.current) missedDeltas.current = true;
+        else fetchData(true);
+      }
+      connected = true;
+    });
+
+    events.addEventListener('dashboard', (event) => {
+      if (fetching.current) {
+        missedDeltas.current = true;
+        return;
+      }
+      const delta = JSON.parse((event as MessageEvent).data) as Partial<DashboardStats>;
+      setStats((current) => {
+        if (!current || current.date !== delta.date) return current;
+        const present = current.present_today + (delta.present_today ?? 0);
+        const absent = current.absent_today + (delta.absent_today ?? 0);
+        const marked = present + absent;
+        return {
+          ...current,
+          total_employees: current.total_employees + (delta.total_employees ?? 0),
+          present_today: present,
+          absent_today: absent,
+          attendance_rate: marked > 0 ? Math.round((present / marked) * 1000) / 10 : 0,
+        };
+      });
+    });
+
+    return () => events.close();
+  }, []);
+
   if (loading) {
     return (
       <div className="flex items-center justify-center min-h-[400px]">
@@ -51,7 +93,7 @@ export default function Dashboard() {
   }
 
   if (error) {
-    return <ErrorState message={error} onRetry={fetchData} />;
+    return <ErrorState message={error} onRetry={() => fetchData()} />;
   }
 
   const statCards = [
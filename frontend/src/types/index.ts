@@ -43,6 +43,15 @@ export interface AttendanceSummary {
   total_days: number;
 }
 
+// Delta sync: apply deleted_employees first, then upsert employees/attendance
+export interface SyncResponse {
+  token: string;
+  full: boolean;
+  employees: Employee[];
+  attendance: Attendance[];
+  deleted_employees: string[];
+}
+
 // API response types
 export interface ApiError {
   detail: string;
@@ -57,3 +66,43 @@ export interface DashboardStats {
 }
 
 
+
+// Compact attendance calendar: one character per day (P/A/-)
+export interface AttendanceCalendar {
+  employee_id: string;
+  start_date: string;
+  end_date: string;
+  days: string;
+  total_present: number;
+  total_absent: number;
+  total_unmarked: number;
+  current_streak: {
+    status: AttendanceStatus | null;
+    days: number;
+  };
+}
+
+// Page bootstrap: a page's first-load data in one response
+export interface BootstrapStats {
+  total_employees: number;
+  present_today: number;
+  absent_today: number;
+  attendance_rate: number;
+  date: string;
+}
+
+interface PageBootstrap {
+  stats: BootstrapStats;
+  employees: Record<string, string>; // employee_id -> full name, newest first
+  today: Record<string, AttendanceStatus>; // employee_id -> today's status, if marked
+}
+
+export interface DashboardBootstrap extends PageBootstrap {
+  page: 'dashboard';
+  summary: AttendanceSummary[];
+}
+
+export interface AttendanceBootstrap extends PageBootstrap {
+  page: 'attendance';
+  attendance: Attendance[];
+}